@@ -1,4 +1,48 @@
-from eerepr.repr import initialize, options, reset
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from eerepr.graph import register_nondeterministic
+    from eerepr.metrics import register_stats_hook, stats, unregister_stats_hook
+    from eerepr.repr import initialize, options, prefetch, reset
 
 __version__ = "0.1.2"
-__all__ = ["initialize", "reset", "options"]
+__all__ = [
+    "initialize",
+    "reset",
+    "options",
+    "prefetch",
+    "register_nondeterministic",
+    "stats",
+    "register_stats_hook",
+    "unregister_stats_hook",
+]
+
+# Public attributes by the module they're imported from on first access, so that
+# importing eerepr doesn't import Earth Engine until reprs are initialized.
+_LAZY_ATTRS = {
+    "initialize": "eerepr.repr",
+    "reset": "eerepr.repr",
+    "options": "eerepr.repr",
+    "prefetch": "eerepr.repr",
+    "register_nondeterministic": "eerepr.graph",
+    "stats": "eerepr.metrics",
+    "register_stats_hook": "eerepr.metrics",
+    "unregister_stats_hook": "eerepr.metrics",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    # Cache the attribute so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRS])
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+import functools
+import heapq
+import itertools
+import json
+import lzma
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from contextlib import ExitStack, closing, contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Hashable, Iterator, Literal, NamedTuple
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    [
+        "hits",
+        "misses",
+        "maxsize",
+        "currsize",
+        "currbytes",
+        "rawbytes",
+        "decompress_time",
+    ],
+)
+
+Compression = Literal["zlib", "lzma"]
+
+# Functions to compress and decompress cached reprs. The lzma preset trades a little
+# compression for a much faster compression than the default.
+COMPRESSORS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (functools.partial(lzma.compress, preset=1), lzma.decompress),
+}
+
+
+def default_cache_dir() -> Path:
+    """Return the platform-specific user cache directory for eerepr."""
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        root = Path.home() / "Library" / "Caches"
+    else:
+        root = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(root) / "eerepr"
+
+
+def _lock_file(file: IO[bytes]) -> None:
+    """Block until an exclusive lock on a file is acquired."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        file.seek(0)
+        # LK_LOCK gives up after 10 seconds, so keep retrying
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            except OSError:
+                continue
+            return
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(file: IO[bytes]) -> None:
+    """Release a lock acquired by `_lock_file`."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class CacheEntry(NamedTuple):
+    """The stored size, uncompressed size, and fetch cost of a cached repr."""
+
+    key: Hashable
+    nbytes: int
+    cost: float
+    raw_nbytes: int
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "raw_nbytes", "cost", "priority")
+
+    def __init__(
+        self, value: str | bytes, cost: float, priority: float, raw_nbytes: int
+    ):
+        self.value = value
+        self.nbytes = len(value)
+        self.raw_nbytes = raw_nbytes
+        self.cost = cost
+        self.priority = priority
+
+
+class ReprCache:
+    """A cache around a repr function, keyed by a canonical key for each object.
+
+    Unlike `functools.lru_cache`, objects are looked up by `key(obj)` rather than their
+    own `__hash__` and `__eq__`, so equivalent objects built separately share an entry.
+    The `cache_info` and `cache_clear` interface mirrors `functools.lru_cache`.
+
+    Without a byte limit, the least recently used entries are evicted first. With a
+    byte limit, entries are evicted by Greedy-Dual-Size priority: the time it took to
+    compute an entry divided by its size, aged so that entries that haven't been used
+    recently are eventually evicted. This keeps slow server calls cached and evicts
+    large, cheap entries first.
+
+    The cache is thread-safe. Concurrent calls for the same key share a single call to
+    `func`, with the other callers waiting on its result.
+
+    Entries can be stored compressed and decompressed on each hit. Sizes and byte
+    limits then apply to the compressed entries, and `cache_info` reports the total
+    uncompressed size and time spent decompressing.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to cache, taking a single object.
+    key : Callable
+        A function returning the cache key for an object.
+    maxsize : int, optional
+        The maximum number of entries to cache. If None, the cache size is unlimited.
+    max_bytes : int, optional
+        The maximum total length of cached reprs. If None, the cache size is unlimited.
+    timer : Callable, optional
+        A function returning the current time in seconds, used to measure how long each
+        entry took to compute. Defaults to `time.perf_counter`.
+    compression : {'zlib', 'lzma'}, optional
+        The algorithm to compress cached reprs with. If None, reprs are stored
+        uncompressed.
+    on_evict : Callable, optional
+        A function called with the stored size of each evicted entry.
+    """
+
+    __wrapped__: Callable[[Any], str]
+
+    def __init__(
+        self,
+        func: Callable[[Any], str],
+        key: Callable[[Any], Hashable],
+        maxsize: int | None = None,
+        max_bytes: int | None = None,
+        timer: Callable[[], float] = time.perf_counter,
+        compression: Compression | None = None,
+        on_evict: Callable[[int], None] | None = None,
+    ):
+        functools.update_wrapper(self, func)
+        self.key = key
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.timer = timer
+        self.compression = compression
+        self.on_evict = on_evict
+        self._compress: Callable[[bytes], bytes] | None = None
+        self._decompress: Callable[[bytes], bytes] | None = None
+        if compression is not None:
+            self._compress, self._decompress = COMPRESSORS[compression]
+        self._decompress_time = 0.0
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        # A lazily-deleted min-heap of (priority, tiebreaker, key) for cost-aware
+        # eviction, and the priority of the last evicted entry.
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+        self._inflation = 0.0
+        # Calls to `func` that are in progress, by key
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.RLock()
+
+    def __call__(self, obj: Any) -> str:
+        key = self.key(obj)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._hits += 1
+                self._data.move_to_end(key)
+                if self.max_bytes is not None:
+                    self._prioritize(key, entry)
+            elif (inflight := self._inflight.get(key)) is not None:
+                self._hits += 1
+            else:
+                call: Future = Future()
+                self._inflight[key] = call
+                self._misses += 1
+
+        if entry is not None:
+            return self._decode(entry.value)
+        # Wait on a call that's already in progress rather than repeating it
+        if inflight is not None:
+            return inflight.result()
+
+        try:
+            start = self.timer()
+            value = self.__wrapped__(obj)
+            cost = self.timer() - start
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            call.set_exception(e)
+            raise
+
+        # Compress before locking, so hits aren't blocked while compressing
+        stored = value if self._compress is None else self._compress(value.encode())
+        with self._lock:
+            del self._inflight[key]
+            self._store(key, stored, raw_nbytes=len(value), cost=cost)
+        call.set_result(value)
+        return value
+
+    def _decode(self, value: str | bytes) -> str:
+        """Decompress a stored repr, if it was compressed."""
+        if isinstance(value, str):
+            return value
+
+        start = self.timer()
+        decoded = self._decompress(value).decode()  # type: ignore
+        elapsed = self.timer() - start
+        with self._lock:
+            self._decompress_time += elapsed
+        return decoded
+
+    def __contains__(self, obj: Any) -> bool:
+        """Check if the repr of an object is cached, without counting a hit or miss."""
+        key = self.key(obj)
+        with self._lock:
+            return key in self._data
+
+    def resize(self, maxsize: int | None, max_bytes: int | None) -> None:
+        """Change the size limits, evicting entries that no longer fit."""
+        with self._lock:
+            self.maxsize = maxsize
+            self.max_bytes = max_bytes
+            # Priorities are only tracked with a byte limit, so rebuild them
+            self._heap.clear()
+            if max_bytes is not None:
+                for key, entry in self._data.items():
+                    self._prioritize(key, entry)
+            self._evict()
+
+    def _prioritize(self, key: Hashable, entry: _Entry) -> None:
+        entry.priority = self._inflation + entry.cost / max(entry.nbytes, 1)
+        heapq.heappush(self._heap, (entry.priority, next(self._counter), key))
+
+    def _store(
+        self, key: Hashable, stored: str | bytes, raw_nbytes: int, cost: float
+    ) -> None:
+        if self.max_bytes is not None and len(stored) > self.max_bytes:
+            return
+
+        entry = _Entry(stored, cost, priority=0.0, raw_nbytes=raw_nbytes)
+        self._data[key] = entry
+        self._nbytes += entry.nbytes
+        if self.max_bytes is not None:
+            self._prioritize(key, entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        while (self.maxsize is not None and len(self._data) > self.maxsize) or (
+            self.max_bytes is not None and self._nbytes > self.max_bytes
+        ):
+            if self.max_bytes is None:
+                _, entry = self._data.popitem(last=False)
+            else:
+                entry = self._pop_cheapest()
+            self._nbytes -= entry.nbytes
+            if self.on_evict is not None:
+                self.on_evict(entry.nbytes)
+
+        # Drop stale heap items left behind by hits and evictions
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [
+                item
+                for item in self._heap
+                if (live := self._data.get(item[2])) is not None
+                and live.priority == item[0]
+            ]
+            heapq.heapify(self._heap)
+
+    def _pop_cheapest(self) -> _Entry:
+        """Remove and return the entry with the lowest priority."""
+        while True:
+            priority, _, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry is not None and entry.priority == priority:
+                self._inflation = priority
+                del self._data[key]
+                return entry
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self.maxsize,
+                len(self._data),
+                self._nbytes,
+                sum(entry.raw_nbytes for entry in self._data.values()),
+                self._decompress_time,
+            )
+
+    def cache_entries(self) -> list[CacheEntry]:
+        """Return the size and fetch cost of each cached repr, oldest first."""
+        with self._lock:
+            return [
+                CacheEntry(key, entry.nbytes, entry.cost, entry.raw_nbytes)
+                for key, entry in self._data.items()
+            ]
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._heap.clear()
+            self._nbytes = 0
+            self._inflation = 0.0
+            self._hits = 0
+            self._misses = 0
+            self._decompress_time = 0.0
+
+
+class DiskCache:
+    """A persistent SQLite cache of HTML reprs that survives kernel restarts.
+
+    Entries are keyed by a digest of the serialized Earth Engine object. Expired
+    entries are ignored on read and purged on write, and the least recently used
+    entries are evicted once the database exceeds its size cap.
+
+    The cache can be shared by every kernel on a machine. Use `lock` to ensure that
+    only one process computes a missing entry while the others wait for it.
+
+    Parameters
+    ----------
+    cache_dir : str or Path, optional
+        The directory to store the cache database in. Defaults to the user cache
+        directory.
+    max_mbs : float, default 500
+        The maximum total size of cached reprs, in MBs.
+    ttl : float, optional
+        The number of seconds before a cached repr expires. If None, entries never
+        expire.
+    """
+
+    FILENAME = "reprs.sqlite"
+    # Keys are locked by hashing them onto a fixed set of lock files, so lock files
+    # don't accumulate as entries are added.
+    LOCK_STRIPES = 256
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_mbs: float = 500,
+        ttl: float | None = None,
+    ):
+        self.path = Path(cache_dir or default_cache_dir()) / self.FILENAME
+        self.max_bytes = int(max_mbs * 1e6)
+        self.ttl = ttl
+
+        self.lock_dir = self.path.parent / "locks"
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        # The lock stripes held by each thread, so that a thread can re-lock them
+        self._held = threading.local()
+        with self._connect() as con:
+            # Write-ahead logging lets kernels read while another kernel writes
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS reprs ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created REAL NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        # A short-lived connection per operation is safe to use across threads and
+        # processes sharing the same database.
+        return closing(sqlite3.connect(self.path, timeout=30, isolation_level=None))
+
+    def _expiry(self) -> float:
+        """Return the creation time before which entries are expired."""
+        return -1.0 if self.ttl is None else time.time() - self.ttl
+
+    @contextmanager
+    def lock(self, *keys: str) -> Iterator[None]:
+        """Hold an exclusive lock on one or more keys, shared across threads and
+        processes.
+
+        Keys are always locked in the same order, so processes locking overlapping
+        keys can't deadlock. A thread that holds the lock on a key can lock it again.
+        Locks are released automatically if the process holding them exits.
+        """
+        stripes = sorted({zlib.crc32(key.encode()) % self.LOCK_STRIPES for key in keys})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._lock_stripe(stripe))
+            yield
+
+    @contextmanager
+    def _lock_stripe(self, stripe: int) -> Iterator[None]:
+        held: set[int] = self._held.__dict__.setdefault("stripes", set())
+        if stripe in held:
+            yield
+            return
+
+        with open(self.lock_dir / f"{stripe}.lock", "a+b") as file:
+            _lock_file(file)
+            held.add(stripe)
+            try:
+                yield
+            finally:
+                held.discard(stripe)
+                _unlock_file(file)
+
+    def get(self, key: str) -> str | None:
+        """Return the cached repr for a key, or None if it is missing or expired."""
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT value FROM reprs WHERE key = ? AND created > ?",
+                (key, self._expiry()),
+            ).fetchone()
+            if row is None:
+                return None
+
+            con.execute(
+                "UPDATE reprs SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key has a cached repr that hasn't expired."""
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT 1 FROM reprs WHERE key = ? AND created > ?",
+                (key, self._expiry()),
+            ).fetchone()
+        return row is not None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a repr, then evict expired and least recently used entries."""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._connect() as con:
+            con.execute("BEGIN IMMEDIATE")
+            con.execute(
+                "INSERT OR REPLACE INTO reprs VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            con.execute("DELETE FROM reprs WHERE created <= ?", (self._expiry(),))
+            self._evict(con)
+            con.execute("COMMIT")
+
+    def _evict(self, con: sqlite3.Connection) -> None:
+        """Delete the least recently used entries until the size cap is met."""
+        (total,) = con.execute("SELECT COALESCE(SUM(size), 0) FROM reprs").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = con.execute("SELECT key, size FROM reprs ORDER BY accessed").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        con.executemany("DELETE FROM reprs WHERE key = ?", evicted)
+
+    def clear(self) -> None:
+        """Delete all cached reprs."""
+        with self._connect() as con:
+            con.execute("DELETE FROM reprs")
+
+    def __len__(self) -> int:
+        with self._connect() as con:
+            return con.execute("SELECT COUNT(*) FROM reprs").fetchone()[0]
+
+
+class Cassette:
+    """A file of info fetched from Earth Engine, recorded to be replayed later without
+    fetching it again.
+
+    Each entry is a line of JSON with its key and either the fetched info or the error
+    raised while fetching it, so recording only appends to the file. If a key is
+    recorded more than once, its last entry is used. The file can be shared by several
+    processes recording at once.
+
+    Parameters
+    ----------
+    path : str or Path
+        The cassette file. It's created when the first entry is recorded.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Skip a line left incomplete by a process that was killed
+                        continue
+                    self._entries[entry.pop("key")] = entry
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the entry recorded for a key, with either an `info` or an `error`
+        item, or None if it wasn't recorded.
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def record(self, key: str, info: Any = None, error: str | None = None) -> None:
+        """Record the info fetched for a key, or the error raised while fetching it."""
+        entry = {"info": info} if error is None else {"error": error}
+        with self._lock:
+            if self._entries.get(key) == entry:
+                return
+            self._entries[key] = entry
+
+            line = json.dumps({"key": key, **entry}, separators=(",", ":")) + "\n"
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as file:
+                _lock_file(file)
+                try:
+                    file.write(line.encode())
+                finally:
+                    _unlock_file(file)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
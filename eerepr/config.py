@@ -7,12 +7,55 @@ from typing import Literal
 @dataclass
 class Config:
     max_cache_size: int | None = None
+    max_cache_bytes: int | None = None
+    max_info_cache_bytes: int | None = None
+    cache_compression: Literal["zlib", "lzma"] | None = None
     max_repr_mbs: int = 100
+    truncate_reprs: bool = False
+    compact_arrays: bool = False
+    list_bucket_size: int | None = None
+    max_list_elements: int | None = None
     on_error: Literal["warn", "raise"] = "warn"
+    max_collection_elements: int | None = None
+    cache_backend: Literal["memory", "disk"] = "memory"
+    cache_dir: str | None = None
+    max_disk_cache_mbs: float = 500
+    cache_ttl: float | None = 86_400
+    mode: Literal["sync", "async"] = "sync"
+    stylesheet: Literal["inline", "once"] = "inline"
+    markup: Literal["default", "compact"] = "default"
+    collect_stats: bool = False
+    cassette: str | None = None
+    cassette_mode: Literal["record", "replay"] = "replay"
 
     def update(self, **kwargs) -> Config:
         if "on_error" in kwargs and kwargs["on_error"] not in ["warn", "raise"]:
             raise ValueError("on_error must be 'warn' or 'raise'")
+        if "cache_backend" in kwargs and kwargs["cache_backend"] not in [
+            "memory",
+            "disk",
+        ]:
+            raise ValueError("cache_backend must be 'memory' or 'disk'")
+        if "cache_compression" in kwargs and kwargs["cache_compression"] not in [
+            None,
+            "zlib",
+            "lzma",
+        ]:
+            raise ValueError("cache_compression must be None, 'zlib', or 'lzma'")
+        if "stylesheet" in kwargs and kwargs["stylesheet"] not in ["inline", "once"]:
+            raise ValueError("stylesheet must be 'inline' or 'once'")
+        if "markup" in kwargs and kwargs["markup"] not in ["default", "compact"]:
+            raise ValueError("markup must be 'default' or 'compact'")
+        bucket_size = kwargs.get("list_bucket_size")
+        if bucket_size is not None and bucket_size < 2:
+            raise ValueError("list_bucket_size must be at least 2")
+        max_list_elements = kwargs.get("max_list_elements")
+        if max_list_elements is not None and max_list_elements < 0:
+            raise ValueError("max_list_elements must be non-negative")
+        if kwargs.get("cassette_mode", "replay") not in ["record", "replay"]:
+            raise ValueError("cassette_mode must be 'record' or 'replay'")
+        if "mode" in kwargs and kwargs["mode"] not in ["sync", "async"]:
+            raise ValueError("mode must be 'sync' or 'async'")
 
         self.__dict__.update(**kwargs)
         return self
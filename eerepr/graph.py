@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict
+
+# A predicate that takes the arguments of a function invocation, with value references
+# resolved, and returns whether that invocation is nondeterministic.
+ArgumentPredicate = Callable[[Dict[str, Any]], bool]
+
+# Server-side algorithms that may return different results each time they're computed,
+# mapped to an optional predicate on their arguments. Algorithms registered without a
+# predicate are always nondeterministic.
+NONDETERMINISTIC_ALGORITHMS: dict[str, ArgumentPredicate | None] = {}
+
+# Max verdicts to memoize before the memo is cleared.
+MAX_VERDICTS = 10_000
+_verdicts: dict[str, bool] = {}
+# Incremented whenever an algorithm is registered, so that verdicts memoized outside
+# this module can be invalidated.
+_registry_version = 0
+
+
+def register_nondeterministic(
+    name: str, predicate: ArgumentPredicate | None = None
+) -> None:
+    """Register a server-side algorithm as nondeterministic so that reprs of objects
+    that invoke it are never cached.
+
+    Parameters
+    ----------
+    name : str
+        The name of the Earth Engine algorithm, e.g. "List.shuffle".
+    predicate : Callable, optional
+        A function that takes a dictionary of the invocation's serialized arguments,
+        e.g. `{"seed": {"constantValue": False}}`, and returns True if that invocation
+        is nondeterministic. Arguments that were left as their defaults are missing.
+        If None, every invocation of the algorithm is nondeterministic.
+    """
+    global _registry_version
+    NONDETERMINISTIC_ALGORITHMS[name] = predicate
+    _verdicts.clear()
+    _registry_version += 1
+
+
+def _is_unseeded(args: dict[str, Any]) -> bool:
+    """Check if a `seed` argument is false or computed on the server.
+
+    A computed seed can't be checked without evaluating it, so it is assumed to be
+    nondeterministic.
+    """
+    if (seed := args.get("seed")) is None:
+        return False
+    if "constantValue" in seed:
+        return seed["constantValue"] is False
+    return True
+
+
+register_nondeterministic("List.shuffle", _is_unseeded)
+
+
+def is_nondeterministic(invocation: str, digest: str | None = None) -> bool:
+    """Check if a serialized object returns nondeterministic results which would break
+    caching.
+
+    The expression graph is walked once, checking each function invocation against
+    the registered nondeterministic algorithms. If a digest of the graph is given, the
+    verdict is memoized by that digest.
+    """
+    if digest is not None and (verdict := _verdicts.get(digest)) is not None:
+        return verdict
+
+    verdict = _walk_graph(invocation)
+
+    if digest is not None:
+        if len(_verdicts) >= MAX_VERDICTS:
+            _verdicts.clear()
+        _verdicts[digest] = verdict
+    return verdict
+
+
+def _walk_graph(invocation: str) -> bool:
+    """Walk a serialized expression graph, looking for nondeterministic invocations."""
+    # Skip parsing graphs that can't invoke any registered algorithm
+    if not any(name in invocation for name in NONDETERMINISTIC_ALGORITHMS):
+        return False
+
+    values = json.loads(invocation).get("values", {})
+
+    # Shared subgraphs are stored once under `values` and referenced by id, so walking
+    # each stored value without following references visits every node once.
+    stack = list(values.values())
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+
+        if (call := node.get("functionInvocationValue")) is not None:
+            args = call.get("arguments", {})
+            name = call.get("functionName")
+            if name in NONDETERMINISTIC_ALGORITHMS:
+                predicate = NONDETERMINISTIC_ALGORITHMS[name]
+                resolved = {k: _resolve(v, values) for k, v in args.items()}
+                if predicate is None or predicate(resolved):
+                    return True
+            stack.extend(args.values())
+        elif (array := node.get("arrayValue")) is not None:
+            stack.extend(array.get("values", []))
+        elif (dictionary := node.get("dictionaryValue")) is not None:
+            stack.extend(dictionary.get("values", {}).values())
+
+    return False
+
+
+def _resolve(node: Any, values: dict[str, Any]) -> Any:
+    """Follow value references to the node they point to."""
+    while isinstance(node, dict) and "valueReference" in node:
+        node = values.get(node["valueReference"])
+    return node
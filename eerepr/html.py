@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import html
+import math
 from datetime import datetime, timezone
-from itertools import chain
-from typing import Any, Hashable
+from itertools import chain, islice
+from typing import Any, Hashable, Iterable, Iterator, Literal, NamedTuple
 
 # Max characters to display for a list before truncating to "List (n elements)"
 MAX_INLINE_LENGTH = 50
@@ -21,8 +22,86 @@ PROPERTY_PRIORITY = [
     "geometry",
     "properties",
 ]
+# Key for the true size of a summarized collection, which is stored alongside its first
+# elements. It isn't returned by Earth Engine, so it's only used for labels.
+SIZE_KEY = "eerepr:size"
 # Format for ee.Date and ee.DateRange
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Closing tags of a collapsible element
+CLOSE_HTML = "</ul></details></li>"
+# Marker for the point where a repr was truncated
+TRUNCATED_HTML = "<li><span class='ee-v'>… (truncated)</span></li>"
+# Max values per line when rendering a flat numeric list as a compact array
+ARRAY_LINE_LENGTH = 10
+# Max rendered subtrees to memoize per render, and max children per level of a subtree
+# for it to be memoized
+MEMO_SIZE = 4096
+MEMO_MAX_CHILDREN = 16
+# Consecutive memo misses after which memoization stops for the rest of a render, so
+# objects without repeated subtrees don't pay for keying them
+MEMO_MAX_MISSES = 64
+
+
+class _Bucket(NamedTuple):
+    """A range of elements of a long list, rendered as a collapsible group."""
+
+    items: list
+    start: int
+    stop: int
+    size: int
+
+
+class Markup(NamedTuple):
+    """The HTML fragments that elements of a repr are built from.
+
+    A collapsible element is `open + header + open_end + children + close`, a compact
+    array is `open + header + array + text + array_end`, and a value is
+    `value + obj + value_end`, or `key + key + key_end + obj + value_end` with a key.
+    """
+
+    open: str
+    open_end: str
+    close: str
+    value: str
+    value_end: str
+    key: str
+    key_end: str
+    array: str
+    array_end: str
+
+    @property
+    def truncated(self) -> str:
+        """The marker for the point where a repr was truncated."""
+        return f"{self.value}… (truncated){self.value_end}"
+
+
+MARKUPS = {
+    "default": Markup(
+        open="<li><details><summary>",
+        open_end="</summary><ul>",
+        close=CLOSE_HTML,
+        value="<li><span class='ee-v'>",
+        value_end="</span></li>",
+        key="<li><span class='ee-k'>",
+        key_end=":</span><span class='ee-v'>",
+        array="</summary><pre class='ee-a'>",
+        array_end="</pre></details></li>",
+    ),
+    # Fewer and shorter elements for smaller reprs, styled by `style.COMPACT_CSS`.
+    # Children are indented by their parent's padding instead of being nested in a
+    # list, and values are separated by line breaks instead of wrapped in elements.
+    "compact": Markup(
+        open="<details><summary>",
+        open_end="</summary>",
+        close="</details>",
+        value="",
+        value_end="<br>",
+        key="<b>",
+        key_end=":</b>",
+        array="</summary><pre>",
+        array_end="</pre></details>",
+    ),
+}
 
 
 def escape_object(obj: Any) -> Any:
@@ -36,8 +115,26 @@ def escape_object(obj: Any) -> Any:
     return obj
 
 
-def convert_to_html(obj: Any, key: Hashable | None = None) -> str:
-    """Converts a Python object (not list or dict) to an HTML <li> element.
+class ReprSizeError(Exception):
+    """Raised when an HTML repr exceeds its maximum size while rendering."""
+
+
+def convert_to_html(
+    obj: Any,
+    key: Hashable | None = None,
+    max_bytes: int | None = None,
+    truncate: bool = False,
+    compact_arrays: bool = False,
+    markup: Literal["default", "compact"] = "default",
+    bucket_size: int | None = None,
+    max_list_elements: int | None = None,
+) -> str:
+    """Converts a Python object to an HTML <li> element.
+
+    The object tree is walked with an explicit stack rather than recursion, and each
+    element is written once into a single buffer, so rendering takes linear time and
+    memory regardless of how deeply the object is nested. Strings are HTML-escaped as
+    they're written to prevent injection.
 
     Parameters
     ----------
@@ -46,61 +143,357 @@ def convert_to_html(obj: Any, key: Hashable | None = None) -> str:
     key : str, optional
         The key to prepend to the object value, in the case of a dictionary value or
         list element.
+    max_bytes : int, optional
+        The maximum length of the HTML. Rendering stops as soon as this is exceeded,
+        rather than after building the entire repr.
+    truncate : bool, default False
+        If True, HTML that would exceed `max_bytes` is truncated with a marker and its
+        open elements are closed. Otherwise, a `ReprSizeError` is raised.
+    compact_arrays : bool, default False
+        If True, numeric lists that are too long to display inline, like coordinates
+        and arrays, are rendered as a single block of text with their shape and range
+        rather than as an element per value.
+    markup : {'default', 'compact'}, default 'default'
+        The markup to build the HTML from. 'compact' uses fewer and shorter elements,
+        and must be styled with `style.COMPACT_CSS`.
+    bucket_size : int, optional
+        If given, lists with more elements than this are grouped into nested ranges,
+        like `[0…99]`, of at most `bucket_size` elements or ranges each. Collapsed lists
+        then contain a few elements rather than every element. If None, every element
+        is a child of the list.
+    max_list_elements : int, optional
+        The maximum number of elements to render from each list, followed by a count of
+        the rest. If None, every element is rendered.
     """
-    if isinstance(obj, list):
-        return list_to_html(obj, key)
-    if isinstance(obj, dict):
-        return dict_to_html(obj, key)
+    fragments = MARKUPS[markup]
+    open_html, open_end, close_html, value_html, value_end, key_html, key_end, *_ = (
+        fragments
+    )
+    truncated_html = fragments.truncated
+    close_len = len(close_html)
+
+    buffer: list[str] = []
+    write = buffer.append
+
+    # Property names and values like types repeat across elements, so escaped strings
+    # are memoized for the duration of the render.
+    escaped: dict[str, str] = {}
+    # Small subtrees like bands and pixel types also repeat, e.g. across the images of
+    # a collection, so their HTML is memoized by key and content.
+    memo: dict[tuple[Hashable | None, str], str] = {}
+    memo_misses = 0
+
+    # Track the bytes left in the budget, reserving enough to close each open element
+    # and mark truncation.
+    remaining = math.inf if max_bytes is None else max_bytes
+    if truncate:
+        remaining -= len(truncated_html)
+
+    # The stack holds an iterator over the (key, value) children of each open element.
+    # Leaf children are written as they're reached, while container children are
+    # opened and pushed onto the stack, then closed once their children are exhausted.
+    stack: list[Iterator[tuple[Hashable | None, Any]]] = [iter([(key, obj)])]
+    # The memo key and buffer position of each open element whose HTML will be memoized
+    memo_stack: list[tuple[tuple[Hashable | None, str], int] | None] = [None]
+    while stack:
+        for key, obj in stack[-1]:
+            children: Iterator | None = None
+            if isinstance(key, str):
+                try:
+                    key = escaped[key]
+                except KeyError:
+                    key = escaped.setdefault(key, html.escape(key))
+
+            memo_key = memoized = None
+            if (
+                memo_misses < MEMO_MAX_MISSES
+                and isinstance(obj, (list, dict))
+                and (content := _subtree_key(obj))
+            ):
+                memo_key = (key, content)
+                memoized = memo.get(memo_key)
+                memo_misses = 0 if memoized is not None else memo_misses + 1
+
+            # Memoized HTML that would exceed the budget is rendered again instead, so
+            # that it's truncated at the same point.
+            if memoized is not None and len(memoized) <= remaining:
+                chunk = memoized
+            elif isinstance(obj, list):
+                array = _array_html(obj, key, fragments) if compact_arrays else None
+                if array is None:
+                    header = _list_header(obj, key)
+                    chunk = f"{open_html}{header}{open_end}"
+                    if bucket_size is None and max_list_elements is None:
+                        children = enumerate(obj)
+                    else:
+                        children = _list_children(obj, bucket_size, max_list_elements)
+                else:
+                    chunk = array
+            elif isinstance(obj, dict):
+                chunk = f"{open_html}{_dict_header(obj, key)}{open_end}"
+                keys = _sort_keys(obj)
+                children = zip(keys, map(obj.__getitem__, keys))
+            elif type(obj) is _Bucket:
+                chunk = f"{open_html}[{obj.start}…{obj.stop - 1}]{open_end}"
+                children = _bucket_children(*obj)
+            else:
+                if isinstance(obj, str):
+                    try:
+                        obj = escaped[obj]
+                    except KeyError:
+                        obj = escaped.setdefault(obj, html.escape(obj))
+                if key is None:
+                    chunk = f"{value_html}{obj}{value_end}"
+                else:
+                    chunk = f"{key_html}{key}{key_end}{obj}{value_end}"
+
+            remaining -= len(chunk) if children is None else len(chunk) + close_len
+            if remaining < 0:
+                if not truncate:
+                    raise ReprSizeError(f"HTML repr exceeds {max_bytes} bytes.")
+                write(truncated_html)
+                write(close_html * (len(stack) - 1))
+                return "".join(buffer)
+
+            write(chunk)
+            if children is not None:
+                stack.append(children)
+                memo_stack.append(
+                    None if memo_key is None else (memo_key, len(buffer) - 1)
+                )
+                break
+            if memo_key is not None and memoized is None and len(memo) < MEMO_SIZE:
+                memo[memo_key] = chunk
+        else:
+            stack.pop()
+            if stack:
+                write(close_html)
+            if (opened := memo_stack.pop()) is not None and len(memo) < MEMO_SIZE:
+                memo[opened[0]] = "".join(buffer[opened[1] :])
+
+    return "".join(buffer)
+
+
+def _subtree_key(obj: list | dict) -> str | None:
+    """Return a content key for a subtree that's small enough to memoize, or None.
+
+    Subtrees are memoized if they're at most two levels deep with at most
+    `MEMO_MAX_CHILDREN` children per level, so checking and keying them takes constant
+    time. The key is the subtree's repr, which distinguishes values like `1`, `1.0`,
+    `True`, and `"1"` that are rendered differently.
+    """
+    if len(obj) > MEMO_MAX_CHILDREN:
+        return None
+    for child in obj.values() if isinstance(obj, dict) else obj:
+        if isinstance(child, (list, dict)):
+            if len(child) > MEMO_MAX_CHILDREN:
+                return None
+            for grandchild in child.values() if isinstance(child, dict) else child:
+                if isinstance(grandchild, (list, dict)):
+                    return None
+    return repr(obj)
+
+
+def _list_children(
+    obj: list, bucket_size: int | None, max_elements: int | None
+) -> Iterator[tuple[Hashable | None, Any]]:
+    """Return the (key, value) children of a list, grouped into ranges of at most
+    `bucket_size` and limited to `max_elements`, followed by a count of the rest.
+    """
+    n = len(obj)
+    stop = n if max_elements is None else min(n, max_elements)
+    children: Iterator[tuple[Hashable | None, Any]]
+    if bucket_size is not None and stop > bucket_size:
+        children = _bucket_children(obj, 0, stop, bucket_size)
+    else:
+        children = enumerate(islice(obj, stop))
 
-    key_html = f"<span class='ee-k'>{key}:</span>" if key is not None else ""
-    return f"<li>{key_html}<span class='ee-v'>{obj}</span></li>"
+    if stop < n:
+        return chain(children, [(None, f"… {n - stop} more")])
+    return children
+
+
+def _bucket_children(
+    obj: list, start: int, stop: int, size: int
+) -> Iterator[tuple[Hashable | None, Any]]:
+    """Return the (key, value) children of a range of a list: its elements if there are
+    at most `size`, otherwise at most `size` evenly sized ranges of them.
+    """
+    n = stop - start
+    if n <= size:
+        indexes = range(start, stop)
+        return zip(indexes, map(obj.__getitem__, indexes))
+
+    span = size
+    while span * size < n:
+        span *= size
+    return (
+        (None, _Bucket(obj, i, min(i + span, stop), size))
+        for i in range(start, stop, span)
+    )
 
 
 def list_to_html(obj: list, key: Hashable | None = None) -> str:
     """Convert a Python list to an HTML <li> element."""
+    return convert_to_html(obj, key)
+
+
+def dict_to_html(obj: dict, key: Hashable | None = None) -> str:
+    """Convert a Python dictionary to an HTML <li> element."""
+    return convert_to_html(obj, key)
+
+
+def _list_header(obj: list, key: Hashable | None) -> str:
+    """Build the summary header for a list."""
     n = len(obj)
     header = f"{key}: " if key is not None else ""
 
+    if (contents := _inline_list(obj)) is not None:
+        return header + contents
+    return header + f"List ({n} {'element' if n == 1 else 'elements'})"
+
+
+def _inline_list(obj: list) -> str | None:
+    """Stringify a list if it's short enough to display inline, otherwise None."""
     # Only stringify the list if it has few enough elements that it might not be
     # truncated.
-    if n < MAX_LIST_LENGTH and len(contents := str(obj)) < MAX_INLINE_LENGTH:
-        header += contents
+    if len(obj) >= MAX_LIST_LENGTH:
+        return None
+    # Flat numeric lists are stringified natively, but nested lists are stringified
+    # lazily to avoid stringifying deep trees in full at every level.
+    if any(isinstance(item, (list, dict, str)) for item in obj):
+        return _short_repr(obj)
+    if len(contents := str(obj)) >= MAX_INLINE_LENGTH:
+        return None
+    return contents
+
+
+def _array_html(obj: list, key: Hashable | None, fragments: Markup) -> str | None:
+    """Render a numeric list that is too long to display inline as a compact text
+    block, with its shape and range in the header. Other lists return None.
+    """
+    if _inline_list(obj) is not None or (array := _numeric_array(obj)) is None:
+        return None
+
+    shape, values = array
+    if len(shape) == 1:
+        rows = [
+            obj[i : i + ARRAY_LINE_LENGTH] for i in range(len(obj))[::ARRAY_LINE_LENGTH]
+        ]
     else:
-        header += f"List ({n} {'element' if n == 1 else 'elements'})"
+        rows = obj
+        for _ in shape[2:]:
+            rows = list(chain.from_iterable(rows))
+
+    # Stringifying each row natively and stripping the brackets is much faster than
+    # formatting each value.
+    text = "\n".join([str(row)[1:-1] for row in rows])
+    dims = "x".join(map(str, shape))
+    header = (f"{key}: " if key is not None else "") + (
+        f"List ({dims}, min {min(values)}, max {max(values)})"
+    )
+    return f"{fragments.open}{header}{fragments.array}{text}{fragments.array_end}"
 
-    children = [convert_to_html(item, key=i) for i, item in enumerate(obj)]
-    return _make_collapsible_li(header, children)
 
+def _numeric_array(obj: list) -> tuple[list[int], list] | None:
+    """Return the shape and flattened values of a rectangular, nested list of numbers,
+    or None if the list is ragged, empty, or contains anything else.
 
-def dict_to_html(obj: dict, key: Hashable | None = None) -> str:
-    """Convert a Python dictionary to an HTML <li> element."""
-    label = _build_label(obj)
-    header = (f"{key}: " if key is not None else "") + label
+    Each level is checked against its first element, so most other lists fail fast.
+    """
+    shape = [len(obj)]
+    values = obj
+    while values and type(values[0]) is list:
+        n = len(values[0])
+        if any(type(row) is not list or len(row) != n for row in values):
+            return None
+        shape.append(n)
+        values = list(chain.from_iterable(values))
 
-    # Sort properties by priority, then alphabetically
-    sorted_keys = [k for k in PROPERTY_PRIORITY if k in obj] + sorted(
+    # Booleans are excluded by checking exact types
+    if not values or any(type(v) is not int and type(v) is not float for v in values):
+        return None
+    return shape, values
+
+
+def _dict_header(obj: dict, key: Hashable | None) -> str:
+    """Build the summary header for a dictionary."""
+    return (f"{key}: " if key is not None else "") + _build_label(obj)
+
+
+def _sort_keys(obj: dict) -> list:
+    """Sort properties by priority, then alphabetically, skipping the size of a
+    summarized collection.
+    """
+    keys = [k for k in PROPERTY_PRIORITY if k in obj] + sorted(
         [k for k in obj if k not in PROPERTY_PRIORITY]
     )
+    if SIZE_KEY in obj:
+        keys.remove(SIZE_KEY)
+    return keys
 
-    children = [convert_to_html(obj[key], key=key) for key in sorted_keys]
-    return _make_collapsible_li(header, children)
 
+def _short_repr(obj: Any, limit: int = MAX_INLINE_LENGTH) -> str | None:
+    """Return `str(obj)` with HTML-escaped strings if it is shorter than `limit`
+    characters, otherwise None.
 
-def _make_collapsible_li(header: str, children: list) -> str:
-    """Package a header and children into a collapsible list element."""
-    return (
-        "<li>"
-        "<details>"
-        f"<summary>{header}</summary>"
-        f"<ul>{''.join(children)}</ul>"
-        "</details>"
-        "</li>"
-    )
+    Stringifying stops as soon as the limit is exceeded, so large or deeply nested
+    objects aren't stringified in full just to be truncated.
+    """
+    if limit <= 2 and isinstance(obj, (list, dict)):
+        # Even an empty container won't fit
+        return None
+    items: Iterable[Any]
+    if isinstance(obj, list):
+        opening, closing, items = "[", "]", obj
+    elif isinstance(obj, dict):
+        opening, closing, items = "{", "}", obj.items()
+    else:
+        if isinstance(obj, str):
+            # An escaped string's repr is at least as long as the string plus quotes
+            if len(obj) + 2 >= limit:
+                return None
+            obj = html.escape(obj)
+        contents = repr(obj)
+        return contents if len(contents) < limit else None
+
+    parts = [opening]
+    length = 2
+    for i, item in enumerate(items):
+        if i:
+            parts.append(", ")
+            length += 2
+        if isinstance(obj, dict):
+            k, v = item
+            k_repr = _short_repr(k, limit - length)
+            if k_repr is None:
+                return None
+            parts.append(f"{k_repr}: ")
+            length += len(k_repr) + 2
+            item = v
+
+        item_repr = _short_repr(item, limit - length)
+        if item_repr is None:
+            return None
+        parts.append(item_repr)
+        length += len(item_repr)
+        if length >= limit:
+            return None
+
+    if length >= limit:
+        return None
+    parts.append(closing)
+    return "".join(parts)
+
+
+def _escape_label(value: Any) -> str:
+    """Stringify a value from an info dictionary for a label, escaping HTML."""
+    return str(escape_object(value))
 
 
 def _build_image_label(obj: dict) -> str:
     obj_id = obj.get("id")
-    id_label = f" {obj_id}" if obj_id else ""
+    id_label = f" {_escape_label(obj_id)}" if obj_id else ""
     n = len(obj.get("bands", []))
     noun = "band" if n == 1 else "bands"
     return f"Image{id_label} ({n} {noun})"
@@ -108,8 +501,9 @@ def _build_image_label(obj: dict) -> str:
 
 def _build_imagecollection_label(obj: dict) -> str:
     obj_id = obj.get("id")
-    id_label = f" {obj_id} " if obj_id else ""
-    n = len(obj.get("features", []))
+    id_label = f" {_escape_label(obj_id)} " if obj_id else ""
+    # Summarized collections store their true size alongside the first N elements
+    n = obj.get(SIZE_KEY, len(obj.get("features", [])))
     noun = "element" if n == 1 else "elements"
     return f"ImageCollection{id_label} ({n} {noun})"
 
@@ -126,16 +520,16 @@ def _build_feature_label(obj: dict) -> str:
     except (TypeError, KeyError):
         geom_type = None
 
-    type_label = f"{geom_type}, " if geom_type is not None else ""
+    type_label = f"{_escape_label(geom_type)}, " if geom_type is not None else ""
     noun = "property" if n == 1 else "properties"
     return f"Feature ({type_label}{n} {noun})"
 
 
 def _build_featurecollection_label(obj: dict) -> str:
     obj_id = obj.get("id")
-    id_label = f" {obj_id} " if obj_id else ""
+    id_label = f" {_escape_label(obj_id)} " if obj_id else ""
     ncols = len(obj.get("columns", []))
-    nfeats = len(obj.get("features", []))
+    nfeats = obj.get(SIZE_KEY, len(obj.get("features", [])))
     col_noun = "column" if ncols == 1 else "columns"
     feat_noun = "element" if nfeats == 1 else "elements"
     return f"FeatureCollection{id_label} ({nfeats} {feat_noun}, {ncols} {col_noun})"
@@ -170,38 +564,40 @@ def _build_multipoint_label(obj: dict) -> str:
     return f"{obj_type} ({n} {noun})"
 
 
+# Names of integer pixel types by their value range
+PIXELTYPE_RANGES = {
+    "[-128, 127]": "signed int8",
+    "[0, 255]": "unsigned int8",
+    "[-32768, 32767]": "signed int16",
+    "[0, 65535]": "unsigned int16",
+    "[-2147483648, 2147483647]": "signed int32",
+    "[0, 4294967295]": "unsigned int32",
+    "[-9.223372036854776e+18, 9.223372036854776e+18]": "signed int64",
+}
+
+
 def _build_pixeltype_label(obj: dict) -> str:
     prec = obj.get("precision", "")
-    minimum = str(obj.get("min", ""))
-    maximum = str(obj.get("max", ""))
+    minimum = _escape_label(obj.get("min", ""))
+    maximum = _escape_label(obj.get("max", ""))
     val_range = f"[{minimum}, {maximum}]"
 
-    type_ranges = {
-        "[-128, 127]": "signed int8",
-        "[0, 255]": "unsigned int8",
-        "[-32768, 32767]": "signed int16",
-        "[0, 65535]": "unsigned int16",
-        "[-2147483648, 2147483647]": "signed int32",
-        "[0, 4294967295]": "unsigned int32",
-        "[-9.223372036854776e+18, 9.223372036854776e+18]": "signed int64",
-    }
-
     if prec in ["double", "float"]:
         return prec
     try:
-        return type_ranges[val_range]
+        return PIXELTYPE_RANGES[val_range]
     except KeyError:
-        return f"{prec} ∈ {val_range}"
+        return f"{_escape_label(prec)} ∈ {val_range}"
 
 
 def _build_band_label(obj: dict) -> str:
     band_id = obj.get("id", "")
     if band_id:
-        band_id = f'"{band_id}"'
+        band_id = f'"{_escape_label(band_id)}"'
     dtype = _build_pixeltype_label(obj.get("data_type", {}))
     dims = obj.get("dimensions")
-    dimensions = f"{dims[0]}x{dims[1]} px" if dims else ""
-    crs = obj.get("crs", "")
+    dimensions = f"{_escape_label(dims[0])}x{_escape_label(dims[1])} px" if dims else ""
+    crs = _escape_label(obj.get("crs", ""))
 
     return ", ".join(filter(None, [band_id, dtype, crs, dimensions]))
 
@@ -224,39 +620,41 @@ def _build_object_label(obj: dict) -> str:
 
 def _build_typed_label(obj: dict) -> str:
     """Build a label for an object with an unrecognized type."""
-    obj_type = obj.get("type")
+    obj_type = _escape_label(obj.get("type"))
     obj_id = obj.get("id", "")
-    id_label = f" {obj_id} " if obj_id else ""
+    id_label = f" {_escape_label(obj_id)} " if obj_id else ""
     return f"{obj_type}{id_label}"
 
 
+# Label builders by the type of an info dictionary
+LABELERS = {
+    "Image": _build_image_label,
+    "ImageCollection": _build_imagecollection_label,
+    "Date": _build_date_label,
+    "Feature": _build_feature_label,
+    "FeatureCollection": _build_featurecollection_label,
+    "Point": _build_point_label,
+    "MultiPoint": _build_multipoint_label,
+    "LineString": _build_multipoint_label,
+    "LinearRing": _build_multipoint_label,
+    "Polygon": _build_polygon_label,
+    "MultiPolygon": _build_multipolygon_label,
+    "PixelType": _build_pixeltype_label,
+    "DateRange": _build_daterange_label,
+}
+
+
 def _build_label(obj: dict) -> str:
     """Take an info dictionary from Earth Engine and return a header label.
 
     These labels attempt to be consistent with outputs from the Code Editor.
     """
-    labelers = {
-        "Image": _build_image_label,
-        "ImageCollection": _build_imagecollection_label,
-        "Date": _build_date_label,
-        "Feature": _build_feature_label,
-        "FeatureCollection": _build_featurecollection_label,
-        "Point": _build_point_label,
-        "MultiPoint": _build_multipoint_label,
-        "LineString": _build_multipoint_label,
-        "LinearRing": _build_multipoint_label,
-        "Polygon": _build_polygon_label,
-        "MultiPolygon": _build_multipolygon_label,
-        "PixelType": _build_pixeltype_label,
-        "DateRange": _build_daterange_label,
-    }
-
     obj_type = obj.get("type", "")
     if not obj_type:
         if "data_type" in obj and "id" in obj:
             return _build_band_label(obj)
         return _build_object_label(obj)
     try:
-        return labelers[obj_type](obj)
+        return LABELERS[obj_type](obj)
     except KeyError:
         return _build_typed_label(obj)
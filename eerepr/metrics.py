@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, NamedTuple
+from warnings import warn
+
+
+class ReprEvent(NamedTuple):
+    """A performance event recorded while displaying an EE object.
+
+    Attributes
+    ----------
+    name : str
+        The kind of event: 'display' for the full repr, 'fetch' for getting info from
+        Earth Engine, 'render' for escaping and converting info to HTML, 'hit' and
+        'miss' for the repr cache, 'evict' for reprs evicted from the repr cache, and
+        'error' and 'size_fallback' for string reprs displayed due to Earth Engine
+        errors or `max_repr_mbs`.
+    ee_type : str
+        The Earth Engine type of the object, e.g. 'Image'. Evictions are recorded
+        without a type, as '*'.
+    duration : float
+        The time taken in seconds, or 0 for events that aren't timed.
+    nbytes : int
+        The size of the output in bytes, or 0 for events without an output.
+    """
+
+    name: str
+    ee_type: str
+    duration: float = 0.0
+    nbytes: int = 0
+
+
+@dataclass
+class EventStats:
+    """Aggregate statistics for one kind of event."""
+
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    total_bytes: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+StatsHook = Callable[[ReprEvent], None]
+
+_hooks: list[StatsHook] = []
+# The ids of hooks that have raised, so each failing hook is only warned about once.
+_failed_hooks: set[int] = set()
+_stats: defaultdict[str, defaultdict[str, EventStats]] = defaultdict(
+    lambda: defaultdict(EventStats)
+)
+_lock = threading.Lock()
+
+
+def record(name: str, ee_type: str, duration: float = 0.0, nbytes: int = 0) -> None:
+    """Record an event and pass it to any registered hooks."""
+    with _lock:
+        stats = _stats[ee_type][name]
+        stats.count += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+        stats.total_bytes += nbytes
+
+    if _hooks:
+        event = ReprEvent(name, ee_type, duration, nbytes)
+        for hook in _hooks:
+            _call_hook(hook, event)
+
+
+def _call_hook(hook: StatsHook, event: ReprEvent) -> None:
+    """Call a stats hook, warning the first time it raises instead of raising."""
+    try:
+        hook(event)
+    except Exception as e:
+        if id(hook) in _failed_hooks:
+            return
+        _failed_hooks.add(id(hook))
+        warn(
+            f"Stats hook {hook!r} failed with: '{e}'. Further errors from this hook"
+            " will be ignored.",
+            stacklevel=2,
+        )
+
+
+def stats(reset: bool = False) -> dict[str, dict[str, EventStats]]:
+    """Return performance statistics recorded while displaying EE objects.
+
+    Statistics are only recorded after running `eerepr.initialize(collect_stats=True)`.
+
+    Parameters
+    ----------
+    reset : bool, default False
+        If True, clear the statistics after returning them.
+
+    Returns
+    -------
+    dict[str, dict[str, EventStats]]
+        Statistics for each Earth Engine type, e.g. 'Image', and kind of event, e.g.
+        'fetch'. See `ReprEvent` for the kinds of events.
+    """
+    with _lock:
+        summary = {
+            ee_type: {
+                name: EventStats(**vars(event_stats))
+                for name, event_stats in events.items()
+            }
+            for ee_type, events in _stats.items()
+        }
+        if reset:
+            _stats.clear()
+    return summary
+
+
+def register_stats_hook(hook: StatsHook) -> None:
+    """Register a function to be called with each `ReprEvent` that is recorded, e.g. to
+    forward events to logging or tracing.
+
+    Hooks are only called after running `eerepr.initialize(collect_stats=True)`. Errors
+    raised by a hook are warned about once and otherwise ignored, so they never break
+    displaying reprs.
+    """
+    _hooks.append(hook)
+
+
+def unregister_stats_hook(hook: StatsHook) -> None:
+    """Remove a hook registered with `register_stats_hook`."""
+    _hooks.remove(hook)
+    _failed_hooks.discard(id(hook))
@@ -1,54 +1,366 @@
 from __future__ import annotations
 
+import contextvars
+import dataclasses
+import functools
+import hashlib
 import html
-from functools import _lru_cache_wrapper, lru_cache
-from typing import Any, Literal, Union
+import json
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Literal, NamedTuple, TypeVar, Union, cast
 from warnings import warn
 
 import ee
 
+from eerepr import graph, metrics
+from eerepr.cache import Cassette, DiskCache, ReprCache
 from eerepr.config import Config
-from eerepr.html import convert_to_html, escape_object
-from eerepr.style import CSS
+from eerepr.html import SIZE_KEY, ReprSizeError, convert_to_html
+from eerepr.style import COMPACT_CSS, CSS
+from eerepr.text import convert_to_text
 
 REPR_HTML = "_repr_html_"
+REPR_MIMEBUNDLE = "_repr_mimebundle_"
 EEObject = Union[ee.Element, ee.ComputedObject]
+F = TypeVar("F", bound=Callable[..., Any])
+
+# A sentinel for missing info, since info may be None.
+_MISSING = object()
+# Info fetched in batches by `prefetch`, keyed by cache key until it's rendered.
+_batched_infos: dict[str, Any] = {}
+
+# Whether the stylesheet has been displayed this session, with `stylesheet="once"`.
+_css_displayed = False
+
+# Serializes `initialize` and `reset` so that they take effect atomically.
+_init_lock = threading.RLock()
 
 # Track which repr methods have been set so we can overwrite them if needed.
-reprs_set: set[EEObject] = set()
+reprs_set: set[tuple[type, str]] = set()
 options = Config()
+# The persistent cache tier, if enabled with `cache_backend="disk"`.
+_disk_cache: DiskCache | None = None
+# The format of reprs stored in the disk cache. Bump it whenever stored reprs change,
+# so that entries written by other versions of eerepr are never displayed.
+DISK_CACHE_FORMAT = 3
+# Fetched info as JSON, kept separately from rendered HTML so that reprs can be
+# re-rendered without fetching them again.
+_info_cache: ReprCache | None = None
+# Info recorded or replayed instead of fetching it, if enabled with `cassette`.
+_cassette: Cassette | None = None
+# The worker threads that fetch and render reprs with `mode="async"`.
+MAX_ASYNC_WORKERS = 4
+_executor: ThreadPoolExecutor | None = None
+
+
+class _DisplayState(NamedTuple):
+    """The options and caches that a display renders with."""
+
+    options: Config
+    repr_html: Callable[[EEObject], str]
+    info_cache: ReprCache | None
+    disk_cache: DiskCache | None
+    cassette: Cassette | None
 
 
-def _attach_html_repr(cls: type, repr: Any) -> None:
-    """Add a HTML repr method to an EE class. Only overwrite the method if it was set by
+# A snapshot of the state for the display running in the current context, so that
+# changes made by `initialize` while a repr is rendering only apply to later reprs.
+_display_state: contextvars.ContextVar[_DisplayState | None] = contextvars.ContextVar(
+    "display_state", default=None
+)
+
+
+def _attach_repr(cls: type, name: str, repr: Any) -> None:
+    """Add a repr method to an EE class. Only overwrite the method if it was set by
     this function.
     """
-    if not hasattr(cls, REPR_HTML) or cls in reprs_set:
-        reprs_set.update([cls])
-        setattr(cls, REPR_HTML, repr)
+    if not hasattr(cls, name) or (cls, name) in reprs_set:
+        reprs_set.add((cls, name))
+        setattr(cls, name, repr)
+
+
+class GraphKey(NamedTuple):
+    """The canonical cache key and caching eligibility of a serialized EE object."""
+
+    digest: str
+    nondeterministic: bool
+
+
+# Graph keys memoized by object id, with the version of the nondeterministic algorithm
+# registry they were checked against. EE objects hash and compare by walking their
+# expression graph, so a `WeakKeyDictionary` would be as slow as re-serializing.
+_graph_keys: dict[int, tuple[weakref.ref, GraphKey, int]] = {}
+
+
+def _state() -> _DisplayState:
+    """Return the state of the current display, or the global state outside of one."""
+    if (state := _display_state.get()) is not None:
+        return state
+    return _DisplayState(options, _repr_html_, _info_cache, _disk_cache, _cassette)
+
+
+def _options() -> Config:
+    """Return the options of the current display, or the global options outside of
+    one.
+    """
+    return _state().options
 
 
-def _is_nondeterministic(obj: EEObject) -> bool:
-    """Check if an object returns nondeterministic results which would break caching.
+def _snapshot_state(func: F) -> F:
+    """Run a display entry point with a snapshot of the global options and caches.
 
-    Currently, this only tests for the case of `ee.List.shuffle(seed=False)`.
+    The snapshot is taken under the `initialize` lock, so it never mixes old and new
+    options or caches, and reprs rendered with old options are never stored in a new
+    cache. Nested entry points, and work submitted to other threads with
+    `contextvars.copy_context`, share the outer snapshot.
     """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _display_state.get() is not None:
+            return func(*args, **kwargs)
+
+        with _init_lock:
+            snapshot = _state()._replace(options=dataclasses.replace(options))
+        token = _display_state.set(snapshot)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _display_state.reset(token)
+
+    return cast(F, wrapper)
+
+
+def _graph_key(obj: EEObject) -> GraphKey:
+    """Serialize an object once and return its graph key, memoized on the object."""
+    obj_id = id(obj)
+    version = graph._registry_version
+    if (
+        (entry := _graph_keys.get(obj_id)) is not None
+        and entry[0]() is obj
+        and entry[2] == version
+    ):
+        return entry[1]
+
     invocation = obj.serialize()
-    shuffled = "List.shuffle" in invocation
-    false_seed = '"seed": {"constantValue": false}' in invocation
-    return shuffled and false_seed
+    digest = hashlib.blake2b(invocation.encode(), digest_size=16).hexdigest()
+    key = GraphKey(digest, graph.is_nondeterministic(invocation, digest))
+
+    try:
+        ref = weakref.ref(obj, lambda _: _graph_keys.pop(obj_id, None))
+    except TypeError:
+        return key
+    _graph_keys[obj_id] = (ref, key, version)
+    return key
+
+
+def _cache_key(obj: EEObject) -> str:
+    """Return the canonical cache key for an object: a digest of its serialized graph.
+
+    Structurally identical objects built separately share the same key.
+    """
+    digest = _graph_key(obj).digest
+    if _is_summarized(obj):
+        return f"{digest}:{_options().max_collection_elements}"
+    return digest
+
+
+def _render_key(obj: EEObject) -> str:
+    """Return the cache key for the rendered HTML of an object.
+
+    Reprs rendered with different options are stored separately, including when
+    options are changed directly rather than with `initialize`.
+    """
+    opts = _options()
+    return (
+        f"{_cache_key(obj)}:{opts.markup}:{opts.compact_arrays:d}:"
+        f"{opts.truncate_reprs:d}:{opts.max_repr_mbs}:{opts.list_bucket_size}:"
+        f"{opts.max_list_elements}"
+    )
+
+
+def _is_summarized(obj: EEObject) -> bool:
+    """Check if an object is a collection that may be summarized before fetching."""
+    return _options().max_collection_elements is not None and isinstance(
+        obj, ee.Collection
+    )
+
+
+def _get_info(obj: EEObject) -> Any:
+    """Get info for an EE object from the info cache, fetching it if needed.
+
+    Nondeterministic objects are always fetched.
+    """
+    info_cache = _state().info_cache
+    if info_cache is None or _graph_key(obj).nondeterministic:
+        return _fetch_info(obj)
+    return json.loads(info_cache(obj))
+
+
+def _fetch_info(obj: EEObject) -> Any:
+    """Fetch info for an EE object, summarizing large collections on the server.
+
+    Summarized collections only include their first `max_collection_elements`
+    elements, with their true size stored under `size`. The size and elements are
+    fetched together, so small collections don't pay for an extra request.
+
+    Info that was already fetched in a batch by `prefetch` is used instead, if
+    available. With a cassette, fetched info is recorded, or replayed from the cassette
+    instead of fetching it.
+    """
+    key = _cache_key(obj)
+    if (info := _batched_infos.pop(key, _MISSING)) is not _MISSING:
+        return info
+
+    cassette = _state().cassette
+    if cassette is not None and _options().cassette_mode == "replay":
+        return _replay_info(cassette, key)
+
+    start = time.perf_counter()
+    try:
+        info = _parse_info(obj, _info_request(obj).getInfo())
+    except ee.EEException as e:
+        if cassette is not None:
+            cassette.record(key, error=str(e))
+        raise
+
+    if _options().collect_stats:
+        metrics.record("fetch", _ee_type(obj), duration=time.perf_counter() - start)
+    if cassette is not None:
+        cassette.record(key, info)
+    return info
+
+
+def _replay_info(cassette: Cassette, key: str) -> Any:
+    """Return info recorded in a cassette, or raise the error recorded fetching it."""
+    if (entry := cassette.get(key)) is None:
+        raise ee.EEException(f"No info was recorded for this object in {cassette.path}")
+    if "error" in entry:
+        raise ee.EEException(entry["error"])
+    return entry["info"]
+
+
+def _serialize_info(obj: EEObject) -> str:
+    """Fetch info for an EE object as compact JSON, to store in the info cache."""
+    return json.dumps(_fetch_info(obj), separators=(",", ":"))
+
+
+def _info_request(obj: EEObject) -> ee.ComputedObject:
+    """Return the object to fetch the info of an EE object from."""
+    if not _is_summarized(obj):
+        return obj
+
+    n = _options().max_collection_elements
+    return ee.List([obj.size(), obj.limit(n)])  # type: ignore
+
+
+def _parse_info(obj: EEObject, info: Any) -> Any:
+    """Return the info of an EE object from the info fetched for its request."""
+    if not _is_summarized(obj):
+        return info
+
+    size, info = info
+    if size > _options().max_collection_elements:  # type: ignore
+        info[SIZE_KEY] = size
+    return info
+
+
+def _get_batch_info(objects: list[EEObject]) -> None:
+    """Fetch the info of many EE objects in a single request, storing it to be used
+    by `_fetch_info`.
+
+    If any object fails, the whole request fails and nothing is stored, so each object
+    is fetched individually instead. When replaying a cassette, nothing is fetched.
+    """
+    cassette = _state().cassette
+    if cassette is not None and _options().cassette_mode == "replay":
+        return
+
+    try:
+        infos = ee.List([_info_request(obj) for obj in objects]).getInfo()
+    except ee.EEException:
+        return
+
+    for obj, info in zip(objects, infos):  # type: ignore
+        key = _cache_key(obj)
+        _batched_infos[key] = _parse_info(obj, info)
+        if cassette is not None:
+            cassette.record(key, _batched_infos[key])
 
 
-@lru_cache(maxsize=None)
 def _repr_html_(obj: EEObject) -> str:
-    """Generate an HTML representation of an EE object."""
-    # Escape all strings in object info to prevent injection
-    info = escape_object(obj.getInfo())
-    body = convert_to_html(info)
+    """Generate the HTML body of an EE object's repr, using the disk cache if
+    enabled.
 
+    The disk cache is shared by every kernel using the same cache directory. It's
+    bypassed while using a cassette, so that every object is recorded or replayed.
+    """
+    state = _state()
+    disk_cache = state.disk_cache
+    if disk_cache is None or state.cassette is not None:
+        return _render_html(obj)
+
+    key = _disk_key(obj)
+    if (rep := disk_cache.get(key)) is not None:
+        return rep
+
+    # Only one kernel renders a missing repr, while the others wait for it to be cached
+    with disk_cache.lock(key):
+        if (rep := disk_cache.get(key)) is None:
+            rep = _render_html(obj)
+            disk_cache.set(key, rep)
+    return rep
+
+
+def _disk_key(obj: EEObject) -> str:
+    """Return the key of an object's repr in the disk cache."""
+    return f"v{DISK_CACHE_FORMAT}:{_render_key(obj)}"
+
+
+def _render_html(obj: EEObject) -> str:
+    """Generate the HTML body of an EE object's repr, without its stylesheet.
+
+    Raises a `ReprSizeError` as soon as the repr exceeds `options.max_repr_mbs`, unless
+    `options.truncate_reprs` is enabled.
+    """
+    # Strings in the object info are escaped while rendering to prevent injection
+    info = _get_info(obj)
+    opts = _options()
+    max_bytes = int(opts.max_repr_mbs * 1e6) - len(_wrap_html(""))
+    start = time.perf_counter()
+    body = convert_to_html(
+        info,
+        max_bytes=max_bytes,
+        truncate=opts.truncate_reprs,
+        compact_arrays=opts.compact_arrays,
+        markup=opts.markup,
+        bucket_size=opts.list_bucket_size,
+        max_list_elements=opts.max_list_elements,
+    )
+    if opts.collect_stats:
+        metrics.record(
+            "render",
+            _ee_type(obj),
+            duration=time.perf_counter() - start,
+            nbytes=len(body),
+        )
+    return body
+
+
+def _wrap_html(body: str, css: bool = True) -> str:
+    """Wrap the HTML body of a repr with its container and, optionally, stylesheet."""
+    if _options().markup == "compact":
+        style = f"<style>{COMPACT_CSS}</style>" if css else ""
+        return f"<div>{style}<div class='eerepr'>{body}</div></div>"
+
+    style = f"<style>{CSS}</style>" if css else ""
     return (
         "<div>"
-        f"<style>{CSS}</style>"
+        f"{style}"
         "<div class='eerepr'>"
         f"<ul>{body}</ul>"
         "</div>"
@@ -57,89 +369,578 @@ def _repr_html_(obj: EEObject) -> str:
 
 
 def _uncached_repr_html_(obj: EEObject) -> str:
-    """Generate an HTML representation of an EE object without caching."""
-    if isinstance(_repr_html_, _lru_cache_wrapper):
-        return _repr_html_.__wrapped__(obj)
-    return _repr_html_(obj)
+    """Generate the HTML body of an EE object's repr without caching."""
+    return _render_html(obj)
 
 
+@_snapshot_state
 def _ee_repr(obj: EEObject) -> str:
     """Handle errors and conditional caching for _repr_html_."""
-    repr_func = _uncached_repr_html_ if _is_nondeterministic(obj) else _repr_html_
+    nondeterministic = _graph_key(obj).nondeterministic
+    repr_func = _uncached_repr_html_ if nondeterministic else _state().repr_html
+    opts = _options()
+    collect_stats = opts.collect_stats
+    cached = None
+    if opts.mode == "async" or collect_stats:
+        cached = isinstance(repr_func, ReprCache) and obj in repr_func
+    if collect_stats:
+        start = time.perf_counter()
+        metrics.record("hit" if cached else "miss", _ee_type(obj))
+
+    if opts.mode == "async" and not cached:
+        handle = _display_placeholder(obj)
+        # Outside of IPython there's no display to update, so render synchronously
+        if handle is not None:
+            _submit(_update_display, handle, obj, repr_func)
+            return ""
+
+    rep = _safe_repr(obj, repr_func)
+    if collect_stats:
+        metrics.record(
+            "display",
+            _ee_type(obj),
+            duration=time.perf_counter() - start,
+            nbytes=len(rep),
+        )
+    return rep
+
+
+@_snapshot_state
+def _ee_repr_mimebundle_(
+    obj: EEObject,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+) -> dict[str, str]:
+    """Generate the reprs of an EE object in the formats requested by IPython.
+
+    HTML is only rendered if it's requested. Front-ends that display HTML get the
+    string repr as plain text, so info is fetched once per bundle, while text-only
+    front-ends get a plain text tree instead.
+    """
+    formats = set(include) if include is not None else _active_formats()
+    formats.difference_update(exclude or ())
 
+    bundle = {}
+    if "text/html" in formats:
+        bundle["text/html"] = _ee_repr(obj)
+        if "text/plain" in formats:
+            bundle["text/plain"] = repr(obj)
+    elif "text/plain" in formats:
+        bundle["text/plain"] = _text_repr(obj)
+    return bundle
+
+
+def _active_formats() -> set[str]:
+    """The formats displayed by the current IPython front-end, e.g. only plain text in
+    a terminal, or both plain text and HTML outside of IPython.
+    """
+    formats = {"text/plain", "text/html"}
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return formats
+
+    if (shell := get_ipython()) is None:
+        return formats
+    return formats.intersection(shell.display_formatter.active_types)
+
+
+def _text_repr(obj: EEObject) -> str:
+    """Generate a plain text tree repr, falling back to the string repr on errors."""
     try:
-        rep = repr_func(obj)
+        info = _get_info(obj)
     except ee.EEException as e:
-        if options.on_error == "raise":
+        if _options().on_error == "raise":
             raise e from None
 
         warn(
             f"Getting info failed with: '{e}'. Falling back to string repr.",
-            stacklevel=2,
+            stacklevel=4,
         )
-        return f"<pre>{html.escape(repr(obj))}</pre>"
+        return repr(obj)
+
+    return convert_to_text(info)
+
+
+def _ee_type(obj: EEObject) -> str:
+    """The Earth Engine type of an object that stats are recorded under."""
+    return type(obj).__name__
+
 
-    mbs = len(rep) / 1e6
-    if mbs > options.max_repr_mbs:
+def _record_eviction(nbytes: int, name: str = "evict") -> None:
+    if _options().collect_stats:
+        metrics.record(name, "*", nbytes=nbytes)
+
+
+def _safe_repr(
+    obj: EEObject, repr_func: Callable[[EEObject], str], wrap: bool = True
+) -> str:
+    """Generate an HTML repr, falling back to the string repr on errors.
+
+    If `wrap` is False, the HTML body is returned without its container, e.g. when
+    rendering into the cache rather than for display.
+    """
+    try:
+        body = repr_func(obj)
+    except ee.EEException as e:
+        if _options().on_error == "raise":
+            raise e from None
+
+        warn(
+            f"Getting info failed with: '{e}'. Falling back to string repr.",
+            stacklevel=4,
+        )
+        if _options().collect_stats:
+            metrics.record("error", _ee_type(obj))
+        return f"<pre>{html.escape(repr(obj))}</pre>"
+    except ReprSizeError:
         warn(
             message=(
-                f"HTML repr size ({mbs:.0f}mB) exceeds maximum"
-                f" ({options.max_repr_mbs:.0f}mB), falling back to string repr. You"
+                "HTML repr size exceeds maximum"
+                f" ({_options().max_repr_mbs:.0f}mB), falling back to string repr. You"
                 " can set `eerepr.options.max_repr_mbs` to print larger objects,"
                 " but this may cause performance issues."
             ),
-            stacklevel=2,
+            stacklevel=4,
         )
+        if _options().collect_stats:
+            metrics.record("size_fallback", _ee_type(obj))
         return f"<pre>{html.escape(repr(obj))}</pre>"
 
-    return rep
+    return _wrap_html(body, css=_use_css()) if wrap else body
+
+
+def _use_css() -> bool:
+    """Check if the stylesheet should be included in the next displayed repr.
+
+    With `stylesheet="once"`, only the first repr of the session includes it.
+    """
+    global _css_displayed
+    if _options().stylesheet == "inline":
+        return True
+
+    with _init_lock:
+        displayed, _css_displayed = _css_displayed, True
+    return not displayed
+
+
+def _display_placeholder(obj: EEObject) -> Any:
+    """Display a placeholder for an object that is being fetched.
+
+    Returns an IPython display handle to update with the repr, or None if there is no
+    IPython display to update.
+    """
+    try:
+        from IPython import get_ipython
+        from IPython.display import display
+    except ImportError:
+        return None
+
+    if get_ipython() is None:
+        return None
+
+    placeholder = f"<pre>Loading {html.escape(type(obj).__name__)}…</pre>"
+    return display(
+        {"text/html": placeholder, "text/plain": repr(obj)},
+        raw=True,
+        display_id=True,
+    )
+
+
+def _submit(func: Callable[..., Any], *args: Any) -> Future:
+    """Run a function on the async worker threads."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(MAX_ASYNC_WORKERS, thread_name_prefix="eerepr")
+
+    # Run in a copy of the current context, so the display's options snapshot is kept
+    return _executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def _update_display(
+    handle: Any, obj: EEObject, repr_func: Callable[[EEObject], str]
+) -> None:
+    """Fetch and render an HTML repr, then replace its placeholder display.
+
+    With `on_error="raise"`, the error is displayed in place of the repr and re-raised
+    to the future.
+    """
+    try:
+        rep = _safe_repr(obj, repr_func)
+    except ee.EEException as e:
+        handle.update(
+            {"text/html": f"<pre>{html.escape(str(e))}</pre>", "text/plain": str(e)},
+            raw=True,
+        )
+        raise
+
+    handle.update({"text/html": rep, "text/plain": repr(obj)}, raw=True)
+
+
+@_snapshot_state
+def prefetch(
+    objects: Iterable[EEObject],
+    max_workers: int = 4,
+    wait: bool = True,
+    batch_size: int = 10,
+) -> list[Future]:
+    """Fetch and cache the HTML reprs of many EE objects concurrently.
+
+    Objects are fetched in batches, with one request per batch. Displaying a
+    prefetched object is then an immediate cache hit. Objects that are already cached
+    or nondeterministic are skipped, and equivalent objects are only fetched once.
+    Objects in the disk cache are loaded from it, rather than fetched again.
+    Errors are warned or raised according to `options.on_error`.
+
+    Parameters
+    ----------
+    objects : Iterable[ee.Element | ee.ComputedObject]
+        The objects to prefetch.
+    max_workers : int, default 4
+        The maximum number of batches to fetch at once. Keep this low to avoid
+        exceeding Earth Engine's concurrent request quota.
+    wait : bool, default True
+        If True, block until every object is cached. Otherwise, return immediately.
+    batch_size : int, default 10
+        The number of objects to fetch in each request. If any object in a batch
+        fails, the objects in that batch are fetched individually instead.
+
+    Returns
+    -------
+    list[Future]
+        A future for each batch that is being fetched.
+    """
+    repr_html = _state().repr_html
+    if not isinstance(repr_html, ReprCache) and _state().disk_cache is None:
+        warn("Caching is disabled, so reprs can't be prefetched.", stacklevel=3)
+        return []
+
+    # Equivalent objects share a cache entry, so only fetch one of them
+    uncached: dict[str, EEObject] = {}
+    for obj in objects:
+        if _graph_key(obj).nondeterministic or (
+            isinstance(repr_html, ReprCache) and obj in repr_html
+        ):
+            continue
+        uncached.setdefault(_cache_key(obj), obj)
+
+    pending = list(uncached.values())
+    executor = ThreadPoolExecutor(max_workers, thread_name_prefix="eerepr-prefetch")
+    futures = [
+        executor.submit(
+            contextvars.copy_context().run,
+            _prefetch_batch,
+            pending[i : i + batch_size],
+        )
+        for i in range(0, len(pending), batch_size)
+    ]
+    # Workers keep running until the submitted objects are fetched
+    executor.shutdown(wait=False)
+
+    if wait:
+        for future in futures:
+            future.result()
+    return futures
+
+
+def _prefetch_batch(objects: list[EEObject]) -> None:
+    """Fetch a batch of EE objects and render them into the cache."""
+    state = _state()
+    failed: dict[int, Exception] = {}
+    if state.disk_cache is not None and state.cassette is None:
+        failed = _prefetch_to_disk(state.disk_cache, objects)
+    elif len(objects) > 1:
+        _get_batch_info(objects)
+
+    # Render the rest of the batch before raising the first error
+    errors = [
+        error
+        for obj in objects
+        if (error := _prefetch_one(obj, failed.get(id(obj)))) is not None
+    ]
+    if errors:
+        raise errors[0]
+
+
+def _prefetch_to_disk(
+    disk_cache: DiskCache, objects: list[EEObject]
+) -> dict[int, Exception]:
+    """Fetch and render the objects of a batch that aren't in the disk cache, returning
+    the error raised by each object that failed, by id.
+
+    The batch is locked while it's fetched, so other kernels wait for it instead of
+    fetching the same objects. Reprs are rendered straight to disk rather than through
+    the memory cache, where a display of the same object may be waiting for the lock.
+    """
+    keys = {_disk_key(obj): obj for obj in objects}
+    with disk_cache.lock(*keys):
+        missing = {key: obj for key, obj in keys.items() if key not in disk_cache}
+        if len(missing) > 1:
+            _get_batch_info(list(missing.values()))
+        return {
+            id(obj): error
+            for key, obj in missing.items()
+            if (error := _render_to_disk(disk_cache, key, obj)) is not None
+        }
+
+
+def _render_to_disk(disk_cache: DiskCache, key: str, obj: EEObject) -> Exception | None:
+    """Render an EE object into the disk cache, returning any error rather than
+    raising.
+    """
+    try:
+        disk_cache.set(key, _render_html(obj))
+    except (ee.EEException, ReprSizeError) as e:
+        return e
+    return None
+
+
+def _prefetch_one(
+    obj: EEObject, error: Exception | None = None
+) -> ee.EEException | None:
+    """Render an EE object into the cache, returning any error rather than raising.
+
+    If rendering the object already failed with `error`, it's handled without
+    fetching the object again.
+    """
+
+    def fail(obj: EEObject) -> str:
+        raise cast(Exception, error)
+
+    try:
+        _safe_repr(obj, _state().repr_html if error is None else fail, wrap=False)
+    except ee.EEException as e:
+        return e
+    finally:
+        # Drop info that wasn't used, e.g. if the object was cached in the meantime
+        _batched_infos.pop(_cache_key(obj), None)
+    return None
 
 
 def initialize(
     max_cache_size: int | None = None,
     max_repr_mbs: int = 100,
     on_error: Literal["warn", "raise"] = "warn",
+    max_collection_elements: int | None = None,
+    cache_backend: Literal["memory", "disk"] = "memory",
+    cache_dir: str | None = None,
+    max_disk_cache_mbs: float = 500,
+    cache_ttl: float | None = 86_400,
+    max_cache_bytes: int | None = None,
+    truncate_reprs: bool = False,
+    compact_arrays: bool = False,
+    mode: Literal["sync", "async"] = "sync",
+    max_info_cache_bytes: int | None = None,
+    cache_compression: Literal["zlib", "lzma"] | None = None,
+    stylesheet: Literal["inline", "once"] = "inline",
+    markup: Literal["default", "compact"] = "default",
+    collect_stats: bool = False,
+    list_bucket_size: int | None = None,
+    max_list_elements: int | None = None,
+    cassette: str | None = None,
+    cassette_mode: Literal["record", "replay"] = "replay",
 ) -> None:
     """Attach HTML repr methods to EE objects and initialize a cache.
 
-    Re-running this function will reset the cache.
+    Re-running this function will reset the cache of rendered reprs. Info fetched from
+    Earth Engine is kept, so reprs are re-rendered with the new options without
+    fetching them again.
 
     Parameters
     ----------
     max_cache_size : int, optional
-        The maximum number of EE objects to cache. If None, the cache size is unlimited.
-        Set to 0 to disable caching.
+        The maximum number of EE objects to cache, for both rendered reprs and fetched
+        info. If None, the cache size is unlimited. Set to 0 to disable caching.
     max_repr_mbs : int, default 100
         The maximum HTML repr size to display, in MBs. Setting this too high may freeze
-        the client when printing very large objects. When a repr exceeds this size, the
-        string repr will be displayed instead along with a warning.
+        the client when printing very large objects. When a repr exceeds this size,
+        rendering stops and the string repr will be displayed instead along with a
+        warning.
     on_error : {'warn', 'raise'}, default 'warn'
         Whether to raise an error or display a warning when an error occurs fetching
         Earth Engine data.
+    max_collection_elements : int, optional
+        The maximum number of elements to fetch from an ImageCollection or
+        FeatureCollection. Larger collections are summarized on the server by fetching
+        only their first elements, while labels still show the total count. If None,
+        all elements are fetched.
+    cache_backend : {'memory', 'disk'}, default 'memory'
+        Where to cache reprs. With 'disk', reprs are also stored in a persistent SQLite
+        database that survives kernel restarts and is shared by every kernel using the
+        same `cache_dir`, so each repr is only fetched by one kernel. Non-deterministic
+        objects are never cached.
+    cache_dir : str, optional
+        The directory for the disk cache. Defaults to the user cache directory, e.g.
+        `~/.cache/eerepr`.
+    max_disk_cache_mbs : float, default 500
+        The maximum size of the disk cache, in MBs. The least recently used reprs are
+        evicted once the cache exceeds this size.
+    cache_ttl : float, optional
+        The number of seconds before a repr in the disk cache expires (default 1 day).
+        If None, reprs never expire.
+    max_cache_bytes : int, optional
+        The maximum total size of cached HTML reprs, in bytes. When exceeded, reprs
+        that were quick to fetch relative to their size are evicted first, so slow
+        server calls stay cached. If None, the cache size is unlimited. Per-entry sizes
+        and fetch times are available from `eerepr.repr._repr_html_.cache_entries()`.
+    truncate_reprs : bool, default False
+        If True, reprs that exceed `max_repr_mbs` are truncated to fit instead of
+        falling back to the string repr.
+    compact_arrays : bool, default False
+        If True, long numeric lists like coordinates and arrays are displayed as a
+        compact block of text with their shape and range, rather than an expandable
+        element per value. This keeps reprs of huge geometries responsive.
+    mode : {'sync', 'async'}, default 'sync'
+        Whether to fetch reprs while blocking the kernel, or in the background. With
+        'async', a placeholder is displayed immediately and replaced with the repr once
+        it is fetched. Cached reprs are always displayed immediately. Outside of
+        IPython, reprs are always fetched synchronously.
+    max_info_cache_bytes : int, optional
+        The maximum total size of cached info fetched from Earth Engine, stored as
+        JSON, in bytes. Evicted info is fetched again the next time its repr is
+        rendered. If None, the cache size is unlimited. Statistics are available from
+        `eerepr.repr._info_cache.cache_info()`.
+    cache_compression : {'zlib', 'lzma'}, optional
+        The algorithm to compress cached reprs and info with in memory. Compressed
+        entries are decompressed each time they're displayed. 'lzma' compresses
+        smaller, while 'zlib' is faster. Sizes and byte limits apply to the compressed
+        entries. If None, entries are stored uncompressed.
+    stylesheet : {'inline', 'once'}, default 'inline'
+        Whether to include the stylesheet in every repr, or only in the first repr
+        displayed after initializing. With 'once', notebooks with many reprs are much
+        smaller, but reprs are unstyled if that first output is cleared. Use 'inline'
+        for notebooks that will be exported.
+    markup : {'default', 'compact'}, default 'default'
+        The HTML markup to render reprs with. 'compact' looks the same, but uses fewer
+        and shorter elements and a minified stylesheet, so reprs are about half the
+        size and larger objects fit within `max_repr_mbs`.
+    collect_stats : bool, default False
+        If True, record the time and output size of fetching, rendering, and displaying
+        reprs, along with cache hits, misses, evictions, and fallbacks to the string
+        repr, by Earth Engine type. Statistics are available from `eerepr.stats()`, and
+        events can be forwarded with `eerepr.register_stats_hook`.
+    list_bucket_size : int, optional
+        If given, long lists are grouped into nested ranges of elements like `[0…99]`,
+        with at most `list_bucket_size` elements or ranges in each, as in the Code
+        Editor. This keeps collapsed lists small in the browser. If None, every element
+        of a list is displayed directly under it.
+    max_list_elements : int, optional
+        The maximum number of elements to display from each list, followed by a count
+        of the rest. Unlike `max_collection_elements`, this applies to every list and
+        doesn't affect what's fetched. If None, every element is displayed.
+    cassette : str, optional
+        A file to record info fetched from Earth Engine to, or replay it from, keyed by
+        a digest of each object's serialized graph. Replaying makes reprs fast and
+        reproducible without network access, e.g. when re-running notebooks in CI. The
+        disk cache isn't used while a cassette is set.
+    cassette_mode : {'record', 'replay'}, default 'replay'
+        With "record", info is fetched as usual and recorded to `cassette`. With
+        "replay", info is read from `cassette` without any requests to Earth Engine,
+        and objects that weren't recorded are handled like errors, per `on_error`.
     """
-    global _repr_html_
-    options.update(
-        max_cache_size=max_cache_size,
-        max_repr_mbs=max_repr_mbs,
-        on_error=on_error,
-    )
+    global _repr_html_, _disk_cache, _info_cache, _css_displayed, _cassette
+    with _init_lock:
+        if cassette and cassette_mode == "replay" and not os.path.exists(cassette):
+            raise FileNotFoundError(f"Cassette {cassette} does not exist.")
+        cassette_changed = (cassette, cassette_mode) != (
+            options.cassette,
+            options.cassette_mode,
+        )
+
+        options.update(
+            max_cache_size=max_cache_size,
+            max_cache_bytes=max_cache_bytes,
+            truncate_reprs=truncate_reprs,
+            compact_arrays=compact_arrays,
+            max_repr_mbs=max_repr_mbs,
+            on_error=on_error,
+            max_collection_elements=max_collection_elements,
+            cache_backend=cache_backend,
+            cache_dir=cache_dir,
+            max_disk_cache_mbs=max_disk_cache_mbs,
+            cache_ttl=cache_ttl,
+            mode=mode,
+            max_info_cache_bytes=max_info_cache_bytes,
+            cache_compression=cache_compression,
+            stylesheet=stylesheet,
+            markup=markup,
+            collect_stats=collect_stats,
+            list_bucket_size=list_bucket_size,
+            max_list_elements=max_list_elements,
+            cassette=cassette,
+            cassette_mode=cassette_mode,
+        )
+        _css_displayed = False
+        _cassette = Cassette(cassette) if cassette else None
+
+        _disk_cache = (
+            DiskCache(cache_dir, max_mbs=max_disk_cache_mbs, ttl=cache_ttl)
+            if cache_backend == "disk"
+            else None
+        )
 
-    if isinstance(_repr_html_, _lru_cache_wrapper):
-        _repr_html_ = _repr_html_.__wrapped__  # type: ignore
+        # Build the new cache before swapping it in, so displays that are already
+        # running finish with the cache they started with.
+        repr_func = _repr_html_
+        if isinstance(repr_func, ReprCache):
+            repr_func = repr_func.__wrapped__  # type: ignore
 
-    if max_cache_size != 0:
-        _repr_html_ = lru_cache(maxsize=options.max_cache_size)(_repr_html_)
+        if max_cache_size != 0:
+            repr_func = ReprCache(
+                repr_func,
+                key=_render_key,
+                maxsize=options.max_cache_size,
+                max_bytes=options.max_cache_bytes,
+                compression=cache_compression,
+                on_evict=_record_eviction,
+            )
+        _repr_html_ = repr_func  # type: ignore
 
-    for cls in [ee.Element, ee.ComputedObject]:
-        _attach_html_repr(cls, _ee_repr)
+        if max_cache_size == 0:
+            _info_cache = None
+        elif _info_cache is None or _info_cache.compression != cache_compression:
+            _info_cache = ReprCache(
+                _serialize_info,
+                key=_cache_key,
+                maxsize=max_cache_size,
+                max_bytes=max_info_cache_bytes,
+                compression=cache_compression,
+                on_evict=functools.partial(_record_eviction, name="info_evict"),
+            )
+        else:
+            _info_cache.resize(maxsize=max_cache_size, max_bytes=max_info_cache_bytes)
+
+        # Info fetched before switching cassettes wasn't recorded to or replayed from
+        # the new cassette, so it's fetched again through the cassette.
+        if cassette_changed:
+            _batched_infos.clear()
+            if _info_cache is not None:
+                _info_cache.cache_clear()
+
+        for cls in [ee.Element, ee.ComputedObject]:
+            _attach_repr(cls, REPR_HTML, _ee_repr)
+            _attach_repr(cls, REPR_MIMEBUNDLE, _ee_repr_mimebundle_)
 
 
 def reset():
-    """Remove HTML repr methods added by eerepr to EE objects and reset the cache."""
-    for cls in reprs_set:
-        if hasattr(cls, REPR_HTML):
-            delattr(cls, REPR_HTML)
-
-    reprs_set.clear()
-    if isinstance(_repr_html_, _lru_cache_wrapper):
-        _repr_html_.cache_clear()
+    """Remove HTML repr methods added by eerepr to EE objects and reset the cache.
+
+    Reprs stored in the disk cache are kept for future sessions.
+    """
+    global _disk_cache, _info_cache, _executor, _cassette
+    with _init_lock:
+        for cls, name in reprs_set:
+            if name in vars(cls):
+                delattr(cls, name)
+
+        reprs_set.clear()
+        _disk_cache = None
+        _cassette = None
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        if isinstance(_repr_html_, ReprCache):
+            _repr_html_.cache_clear()
+        if _info_cache is not None:
+            _info_cache.cache_clear()
+            _info_cache = None
@@ -66,6 +66,12 @@ body.vscode-dark {
   color: var(--font-color-primary);
 }
 
+.eerepr pre.ee-a {
+  color: var(--font-color-primary);
+  font-family: monospace;
+  margin: 0 0 0 1.5em;
+}
+
 .eerepr details > summary::before {
   content: '▼';
   display: inline-block;
@@ -86,3 +92,34 @@ body.vscode-dark {
   list-style-type: none;
 }
 """
+
+# A minified stylesheet for reprs rendered with the compact markup, which looks the
+# same as `CSS` with the default markup.
+COMPACT_CSS = (
+    ":root{"
+    "--font-color-primary:var(--jp-content-font-color0,rgba(0,0,0,1));"
+    "--font-color-secondary:var(--jp-content-font-color2,rgba(0,0,0,.7));"
+    "--font-color-accent:rgba(123,31,162,1);"
+    "--border-color:var(--jp-border-color2,#e0e0e0);"
+    "--background-color-row-odd:var(--jp-layout-color2,#eee)}"
+    "html[theme=dark],body[data-theme=dark],body.vscode-dark{"
+    "--font-color-primary:rgba(255,255,255,1);"
+    "--font-color-secondary:rgba(255,255,255,.7);"
+    "--font-color-accent:rgb(173,132,190);"
+    "--border-color:#2e2e2e;"
+    "--background-color-row-odd:#313131}"
+    ".eerepr{padding:1em;line-height:1.5em;min-width:300px;max-width:1200px;"
+    "overflow-y:scroll;max-height:600px;border:1px solid var(--border-color);"
+    "font-family:monospace;font-size:14px;color:var(--font-color-primary)}"
+    ".eerepr details{padding-left:1.5em}"
+    ".eerepr summary{margin-left:-1.5em;color:var(--font-color-secondary);"
+    "cursor:pointer;list-style-type:none}"
+    ".eerepr summary:hover{color:var(--font-color-primary);"
+    "background-color:var(--background-color-row-odd)}"
+    ".eerepr summary::-webkit-details-marker{display:none}"
+    ".eerepr summary::before{content:'▼';display:inline-block;margin-right:6px;"
+    "transition:transform .2s;transform:rotate(-90deg)}"
+    ".eerepr details[open]>summary::before{transform:rotate(0)}"
+    ".eerepr b{color:var(--font-color-accent);font-weight:normal;margin-right:6px}"
+    ".eerepr pre{font-family:monospace;margin:0}"
+)
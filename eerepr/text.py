@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import html
+from itertools import chain, islice
+from typing import Any, Hashable, Iterator
+
+from eerepr.html import _dict_header, _inline_list, _list_header, _sort_keys
+
+# The default limits of plain text reprs, which are meant to be skimmed rather than
+# explored like HTML reprs.
+MAX_DEPTH = 2
+MAX_ITEMS = 10
+MAX_WIDTH = 100
+INDENT = "  "
+
+# A marker for the elements of a container that were left out by `max_items`.
+_MORE = object()
+
+
+def convert_to_text(
+    obj: Any,
+    key: Hashable | None = None,
+    max_depth: int | None = MAX_DEPTH,
+    max_items: int | None = MAX_ITEMS,
+    max_width: int | None = MAX_WIDTH,
+) -> str:
+    """Convert a Python object to a plain text tree.
+
+    Each container is written as the same label used in HTML reprs, followed by its
+    children indented one level deeper. Lists that are short enough to display inline
+    aren't expanded.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to convert to text.
+    key : str, optional
+        The key to prepend to the object value, in the case of a dictionary value or
+        list element.
+    max_depth : int, optional
+        The maximum depth of containers to expand. Deeper containers are written as
+        their label alone. If None, every container is expanded.
+    max_items : int, optional
+        The maximum number of children to write for each container, followed by a
+        count of the rest. If None, every child is written.
+    max_width : int, optional
+        The maximum length of each line. Longer lines are cut off with an ellipsis. If
+        None, lines aren't cut off.
+    """
+    lines: list[str] = []
+
+    # As in `convert_to_html`, the stack holds an iterator over the (key, value)
+    # children of each open container, so deeply nested objects don't recurse.
+    stack: list[Iterator[tuple[Any, Any]]] = [iter([(key, obj)])]
+    while stack:
+        depth = len(stack) - 1
+        for key, obj in stack[-1]:
+            children: Iterator | None = None
+            n = 0
+            if key is _MORE:
+                line = f"… ({obj} more)"
+            elif isinstance(obj, list):
+                # Labels are HTML-escaped, so they're unescaped for plain text
+                line = html.unescape(_list_header(obj, key))
+                if _inline_list(obj) is None:
+                    children, n = enumerate(obj), len(obj)
+            elif isinstance(obj, dict):
+                line = html.unescape(_dict_header(obj, key))
+                keys = _sort_keys(obj)
+                children, n = zip(keys, map(obj.__getitem__, keys)), len(keys)
+            else:
+                line = f"{key}: {obj}" if key is not None else str(obj)
+
+            line = INDENT * depth + line
+            if max_width is not None and len(line) > max_width:
+                line = line[: max_width - 1] + "…"
+            lines.append(line)
+
+            if children is not None and (max_depth is None or depth < max_depth):
+                if max_items is not None and n > max_items:
+                    children = chain(
+                        islice(children, max_items), [(_MORE, n - max_items)]
+                    )
+                stack.append(children)
+                break
+        else:
+            stack.pop()
+
+    return "\n".join(lines)
@@ -0,0 +1,218 @@
+"""Benchmark the rendering pipeline against synthetic payloads, without network access.
+
+Each benchmark runs at increasing payload sizes, reporting the best time and peak
+memory at each size, and how time scaled from the previous size. Scaling that looks
+super-linear is flagged for a closer look, but timings are too noisy between runs to
+fail on. Benchmarks that exceed the recursion limit are reported and skipped at larger
+sizes.
+
+Usage: hatch run test:bench [--max-size N] [--repeat N] [-k PATTERN]
+
+Outside of hatch, install eerepr first with `pip install -e .` and run
+`python tests/benchmark.py` with the same arguments.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import math
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import ee
+
+import eerepr
+from eerepr.html import _build_label, convert_to_html, escape_object
+from eerepr.repr import _ee_repr
+
+# Time growing by more than n**SCALING_THRESHOLD between sizes is flagged. This leaves
+# headroom for timing noise and cache effects at larger sizes.
+SCALING_THRESHOLD = 1.3
+
+
+class Payload(ee.ComputedObject):
+    """An EE object whose info is returned locally rather than fetched."""
+
+    def __init__(self, info: Any, name: str):
+        super().__init__(None, None, name)
+        self.info = info
+
+    def getInfo(self) -> Any:
+        return self.info
+
+
+def feature_collection(n: int) -> dict:
+    """Info for a FeatureCollection of `n` unique point features with a few properties.
+
+    No subtrees repeat, so this measures the overhead of checking for repeats.
+    """
+    return {
+        "type": "FeatureCollection",
+        "columns": {"id": "Integer", "name": "String", "value": "Float"},
+        "properties": {"system:index": "collection"},
+        "features": [
+            {
+                "type": "Feature",
+                "id": str(i),
+                "geometry": {"type": "Point", "coordinates": [i * 1e-3, -i * 1e-3]},
+                "properties": {"id": i, "name": f"<feature {i}>", "value": i / 3},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def image_collection(n: int) -> dict:
+    """Info for an ImageCollection of `n` images with the same bands, whose repeated
+    subtrees are only rendered once.
+    """
+    bands = [
+        {
+            "id": f"B{i}",
+            "data_type": {
+                "type": "PixelType",
+                "precision": "int",
+                "min": 0,
+                "max": 255,
+            },
+            "dimensions": [7661, 7801],
+            "crs": "EPSG:32610",
+            "crs_transform": [30, 0, 464385, 0, -30, 4264515],
+        }
+        for i in range(4)
+    ]
+    return {
+        "type": "ImageCollection",
+        "features": [
+            {"type": "Image", "id": f"image_{i}", "bands": bands} for i in range(n)
+        ],
+    }
+
+
+def nested_dict(n: int) -> dict:
+    """A dictionary nested `n` levels deep."""
+    info: dict = {"value": 0}
+    for i in range(n):
+        info = {"level": i, "name": f"level {i}", "child": info}
+    return info
+
+
+def polygon(n: int) -> dict:
+    """Info for a polygon Feature with `n` vertices."""
+    coords = [
+        [math.cos(2 * math.pi * i / n), math.sin(2 * math.pi * i / n)] for i in range(n)
+    ]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [[*coords, coords[0]]]},
+        "properties": {},
+    }
+
+
+PAYLOADS: dict[str, tuple[Callable[[int], Any], list[int]]] = {
+    "feature_collection": (feature_collection, [10_000, 100_000, 1_000_000]),
+    "image_collection": (image_collection, [1_000, 10_000, 100_000]),
+    "nested_dict": (nested_dict, [1_000, 10_000, 100_000]),
+    "polygon": (polygon, [10_000, 100_000, 1_000_000]),
+}
+
+
+def _render(info: Any) -> Any:
+    return convert_to_html(info)
+
+
+def _label_features(info: Any) -> Any:
+    return [_build_label(feature) for feature in info.get("features", [info])]
+
+
+def _display(info: Any) -> Any:
+    return _ee_repr(Payload(info, name=f"payload{id(info)}"))
+
+
+BENCHMARKS: dict[str, Callable[[Any], Any]] = {
+    "escape_object": escape_object,
+    "convert_to_html": _render,
+    "_build_label": _label_features,
+    "_ee_repr": _display,
+}
+
+
+def measure(func: Callable[[Any], Any], info: Any, repeat: int) -> tuple[float, int]:
+    """Return the best time in seconds and the peak memory in bytes of `func(info)`."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(info)
+        times.append(time.perf_counter() - start)
+
+    # Trace memory separately, since tracing slows down allocations
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(info)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def run(max_size: int, repeat: int, pattern: str | None = None) -> None:
+    """Run the benchmarks and print the results."""
+    # Render every repr from scratch, without size limits
+    eerepr.initialize(max_cache_size=0, max_repr_mbs=100_000)
+
+    print(f"{'benchmark':<16} {'payload':<20} {'size':>9} {'time':>11} {'peak':>11}")
+    for payload_name, (build, sizes) in PAYLOADS.items():
+        payloads = [(n, build(n)) for n in sizes if n <= max_size]
+        for bench_name, func in BENCHMARKS.items():
+            if pattern and pattern not in f"{bench_name} {payload_name}":
+                continue
+
+            last: tuple[int, float] | None = None
+            for n, info in payloads:
+                try:
+                    seconds, peak = measure(func, info, repeat)
+                except RecursionError:
+                    # Larger payloads would fail the same way
+                    print(f"{bench_name:<16} {payload_name:<20} {n:>9,} RecursionError")
+                    break
+
+                line = (
+                    f"{bench_name:<16} {payload_name:<20} {n:>9,}"
+                    f" {seconds * 1e3:>9.1f}ms {peak / 1e6:>9.1f}MB"
+                )
+                if last is not None:
+                    exponent = math.log(seconds / last[1]) / math.log(n / last[0])
+                    line += f"  O(n^{exponent:.2f})"
+                    if exponent > SCALING_THRESHOLD:
+                        line += "  (super-linear?)"
+                print(line, flush=True)
+                last = (n, seconds)
+
+    eerepr.reset()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=100_000,
+        help="The largest payload size to run, e.g. 1000000 for 1M features.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="The number of timed runs per size."
+    )
+    parser.add_argument(
+        "-k", dest="pattern", help="Only run benchmarks or payloads matching this."
+    )
+    args = parser.parse_args()
+
+    run(args.max_size, args.repeat, args.pattern)
+
+
+if __name__ == "__main__":
+    main()
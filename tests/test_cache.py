@@ -1,8 +1,17 @@
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import ee
 import pytest
 
 import eerepr
+import eerepr.graph
 import eerepr.repr
+from eerepr.cache import Cassette, DiskCache, ReprCache
+from eerepr.graph import NONDETERMINISTIC_ALGORITHMS, is_nondeterministic
 from tests.test_html import get_test_objects
 
 
@@ -32,6 +41,127 @@ def test_nondeterministic_uncached():
     assert cache.cache_info().currsize == 0
 
 
+def test_nondeterministic_value_reference():
+    """Shuffles with a seed stored as a shared value reference should be detected."""
+    invocation = json.dumps(
+        {
+            "result": "0",
+            "values": {
+                "1": {"constantValue": False},
+                "0": {
+                    "functionInvocationValue": {
+                        "functionName": "List.shuffle",
+                        "arguments": {
+                            "list": {"constantValue": [0, 1, 2]},
+                            "seed": {"valueReference": "1"},
+                        },
+                    }
+                },
+            },
+        }
+    )
+    assert is_nondeterministic(invocation)
+
+
+@pytest.mark.parametrize(
+    ("seed", "expected"), [(False, True), (True, False), (42, False), (None, False)]
+)
+def test_nondeterministic_shuffle_seed(seed, expected):
+    """Only shuffles with `seed=False` should be nondeterministic."""
+    args = {"list": {"constantValue": [0, 1, 2]}}
+    if seed is not None:
+        args["seed"] = {"constantValue": seed}
+    invocation = json.dumps(
+        {
+            "result": "0",
+            "values": {
+                "0": {
+                    "functionInvocationValue": {
+                        "functionName": "List.shuffle",
+                        "arguments": args,
+                    }
+                }
+            },
+        }
+    )
+    assert is_nondeterministic(invocation) is expected
+
+
+def test_register_nondeterministic(mocker):
+    """Objects invoking user-registered nondeterministic algorithms aren't cached."""
+    mocker.patch.dict(NONDETERMINISTIC_ALGORITHMS)
+    mocker.patch.dict(eerepr.graph._verdicts)
+    eerepr.initialize()
+
+    eerepr.register_nondeterministic("Number.add")
+    ee.Number(1).add(2)._repr_html_()
+    assert eerepr.repr._repr_html_.cache_info().currsize == 0
+
+
+def test_register_nondeterministic_displayed(mocker):
+    """Registering an algorithm should invalidate verdicts of displayed objects."""
+    mocker.patch.dict(NONDETERMINISTIC_ALGORITHMS)
+    mocker.patch.dict(eerepr.graph._verdicts)
+    eerepr.initialize()
+    obj = ee.Number(1).subtract(2)
+    obj._repr_html_()
+    assert not eerepr.repr._graph_key(obj).nondeterministic
+
+    eerepr.register_nondeterministic("Number.subtract")
+    assert eerepr.repr._graph_key(obj).nondeterministic
+
+
+def test_equivalent_objects_share_cache():
+    """Structurally identical objects built separately should share a cache entry."""
+    eerepr.initialize()
+    cache = eerepr.repr._repr_html_
+
+    ee.List([1, 2, 3]).map(lambda x: ee.Number(x).add(1))._repr_html_()
+    ee.List([1, 2, 3]).map(lambda x: ee.Number(x).add(1))._repr_html_()
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().currsize == 1
+
+
+def test_serialized_once_per_object(mocker):
+    """Repeated reprs of the same object should reuse its memoized cache key."""
+    eerepr.initialize()
+    spy = mocker.spy(ee.ComputedObject, "serialize")
+
+    obj = ee.Number(42).add(1)
+    obj._repr_html_()
+    n_calls = spy.call_count
+    obj._repr_html_()
+    assert spy.call_count == n_calls
+
+
+def test_max_cache_bytes_evicts_cheapest(mocker):
+    """Entries that were quick to compute for their size should be evicted first."""
+    # Each miss is timed by two timer calls: a takes 5s, b 1ms, c 1s, and ddd 1s.
+    timer = mocker.Mock(side_effect=[0, 5, 0, 0.001, 0, 1, 0, 1])
+    cache = ReprCache(
+        lambda obj: obj * 5, key=lambda obj: obj, max_bytes=10, timer=timer
+    )
+
+    cache("a")
+    cache("b")
+    cache("c")
+    entries = {entry.key: entry for entry in cache.cache_entries()}
+    assert set(entries) == {"a", "c"}
+    assert entries["a"].nbytes == 5
+    assert entries["a"].cost == 5
+    assert cache.cache_info().currbytes == 10
+
+    # Entries larger than the whole cache are never stored
+    cache("d" * 3)
+    assert "ddd" not in {entry.key for entry in cache.cache_entries()}
+
+
+def test_max_cache_bytes_param():
+    """Test that the byte limit is passed to the repr cache."""
+    eerepr.initialize(max_cache_bytes=1_000)
+    assert eerepr.repr._repr_html_.max_bytes == 1_000
+
+
 def test_reset_cache():
     """Test that the cache is correctly reset."""
     eerepr.initialize()
@@ -40,3 +170,307 @@ def test_reset_cache():
     assert cache.cache_info().currsize == 1
     eerepr.reset()
     assert cache.cache_info().currsize == 0
+
+
+def test_info_cache_rerender():
+    """Re-initializing should re-render reprs from cached info without fetching."""
+    eerepr.initialize()
+    obj = ee.List.sequence(0, 20)
+    rep = obj._repr_html_()
+
+    ee.ComputedObject.getInfo.reset_mock()
+    eerepr.initialize(compact_arrays=True)
+    compact_rep = obj._repr_html_()
+
+    assert compact_rep != rep
+    assert "<pre class='ee-a'>" in compact_rep
+    assert ee.ComputedObject.getInfo.call_count == 0
+    assert eerepr.repr._info_cache.cache_info().hits == 1
+
+
+def test_info_cache_limits():
+    """The info cache should have its own byte limit."""
+    eerepr.initialize(max_info_cache_bytes=10)
+    ee.Number(42)._repr_html_()
+    ee.List.sequence(0, 20)._repr_html_()
+
+    assert eerepr.repr._info_cache.cache_info().currsize == 1
+    assert eerepr.repr._repr_html_.cache_info().currsize == 2
+
+
+def test_disk_cache_persists(tmp_path):
+    """Test that reprs in the disk cache survive re-initializing the memory cache."""
+    eerepr.initialize(cache_backend="disk", cache_dir=tmp_path)
+    rep = ee.Number(42)._repr_html_()
+    assert ee.ComputedObject.getInfo.call_count == 1
+
+    # Simulate a kernel restart by clearing the in-memory cache
+    eerepr.reset()
+    eerepr.initialize(cache_backend="disk", cache_dir=tmp_path)
+    assert ee.Number(42)._repr_html_() == rep
+    assert ee.ComputedObject.getInfo.call_count == 1
+
+
+def test_disk_cache_ttl(tmp_path):
+    """Test that expired reprs in the disk cache are re-fetched."""
+    eerepr.initialize(max_cache_size=0, cache_backend="disk", cache_dir=tmp_path)
+    eerepr.repr._disk_cache.ttl = -1
+
+    ee.Number(42)._repr_html_()
+    ee.Number(42)._repr_html_()
+    assert ee.ComputedObject.getInfo.call_count == 2
+
+
+def test_disk_cache_format(tmp_path, monkeypatch):
+    """Test that reprs stored in another format are re-fetched."""
+    eerepr.initialize(max_cache_size=0, cache_backend="disk", cache_dir=tmp_path)
+    ee.Number(42)._repr_html_()
+
+    monkeypatch.setattr("eerepr.repr.DISK_CACHE_FORMAT", 0)
+    ee.Number(42)._repr_html_()
+    assert ee.ComputedObject.getInfo.call_count == 2
+
+
+def test_disk_cache_nondeterministic_uncached(tmp_path):
+    """Test that nondeterministic objects are not stored in the disk cache."""
+    eerepr.initialize(cache_backend="disk", cache_dir=tmp_path)
+
+    ee.List([0, 1, 2]).shuffle(seed=False)._repr_html_()
+    assert len(eerepr.repr._disk_cache) == 0
+
+
+def test_disk_cache_size_cap(tmp_path, mocker):
+    """Test that the least recently used reprs are evicted beyond the size cap."""
+    mocker.patch("eerepr.cache.time.time", side_effect=itertools.count())
+    cache = DiskCache(tmp_path, max_mbs=10 / 1e6)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    assert cache.get("a") == "12345"
+
+    cache.set("c", "12345")
+    assert cache.get("b") is None
+    assert cache.get("a") == "12345"
+    assert cache.get("c") == "12345"
+
+    # Entries larger than the whole cache are never stored
+    cache.set("d", "12345678901")
+    assert cache.get("d") is None
+
+
+def test_disk_cache_single_render(tmp_path, mocker):
+    """Kernels sharing a disk cache should only render a missing repr once."""
+    eerepr.initialize(max_cache_size=0, cache_backend="disk", cache_dir=tmp_path)
+
+    def slow_render(obj):
+        time.sleep(0.05)
+        return "<div></div>"
+
+    render = mocker.patch("eerepr.repr._render_html", side_effect=slow_render)
+    objects = [ee.Number(1) for _ in range(4)]
+    with ThreadPoolExecutor(4) as executor:
+        reprs = list(executor.map(eerepr.repr._repr_html_, objects))
+
+    assert reprs == ["<div></div>"] * 4
+    assert render.call_count == 1
+
+
+def test_disk_cache_lock_reentrant(tmp_path):
+    """A thread holding the lock on a key should be able to lock it again."""
+    cache = DiskCache(tmp_path)
+
+    def lock_twice():
+        with cache.lock("a", "b"), cache.lock("b"):
+            return True
+
+    # Locks should be released once they're exited, for other threads to acquire
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(lock_twice).result(timeout=5)
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(lock_twice).result(timeout=5)
+
+
+def test_prefetch(mocker):
+    """Prefetched objects should be cached, so displaying them doesn't fetch info."""
+    eerepr.initialize()
+    cache = eerepr.repr._repr_html_
+    objects = [ee.Number(i) for i in range(5)] + [ee.Number(0)]
+
+    futures = eerepr.prefetch(objects, max_workers=2, batch_size=1)
+    assert len(futures) == 5
+    assert cache.cache_info().currsize == 5
+
+    get_info = mocker.patch("ee.ComputedObject.getInfo")
+    for obj in objects:
+        obj._repr_html_()
+    get_info.assert_not_called()
+    assert eerepr.prefetch(objects) == []
+
+
+def test_prefetch_batched():
+    """Batched objects should be fetched in a single request and cached individually."""
+    eerepr.initialize()
+    cache = eerepr.repr._repr_html_
+    objects = [ee.Number(i) for i in range(4)]
+
+    ee.ComputedObject.getInfo.reset_mock()
+    eerepr.prefetch(objects, batch_size=4)
+    assert ee.ComputedObject.getInfo.call_count == 1
+    assert cache.cache_info().currsize == 4
+    assert eerepr.repr._batched_infos == {}
+
+
+def test_prefetch_disk_cache(tmp_path):
+    """Objects in a disk cache shared with another kernel shouldn't be fetched."""
+    objects = [ee.Number(i) for i in range(4)]
+    eerepr.initialize(cache_backend="disk", cache_dir=tmp_path)
+    eerepr.prefetch(objects, batch_size=4)
+
+    eerepr.reset()
+    eerepr.initialize(cache_backend="disk", cache_dir=tmp_path)
+    ee.ComputedObject.getInfo.reset_mock()
+    eerepr.prefetch(objects, batch_size=4)
+    assert ee.ComputedObject.getInfo.call_count == 0
+    assert eerepr.repr._repr_html_.cache_info().currsize == 4
+
+
+def test_prefetch_batch_error():
+    """One failing object shouldn't prevent the rest of its batch from being cached."""
+    eerepr.initialize()
+    cache = eerepr.repr._repr_html_
+    objects = [ee.Number(0), ee.Projection("not a real epsg"), ee.Number(1)]
+
+    with pytest.warns(UserWarning, match="Getting info failed"):
+        eerepr.prefetch(objects, batch_size=3)
+    assert cache.cache_info().currsize == 2
+
+
+def test_concurrent_calls_share_fetch():
+    """Concurrent calls for the same key should wait on a single call."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_repr(obj):
+        calls.append(obj)
+        started.set()
+        release.wait(timeout=5)
+        return f"<div>{obj}</div>"
+
+    cache = ReprCache(slow_repr, key=str)
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(cache, "a")
+        started.wait(timeout=5)
+        rest = [executor.submit(cache, "a") for _ in range(3)]
+        release.set()
+        results = [f.result(timeout=5) for f in [first, *rest]]
+
+    assert calls == ["a"]
+    assert results == ["<div>a</div>"] * 4
+    assert cache.cache_info().misses == 1
+
+
+def test_concurrent_call_errors_shared():
+    """Callers waiting on a failed call should get its error, without caching it."""
+    release = threading.Event()
+
+    def failing_repr(obj):
+        release.wait(timeout=5)
+        raise ValueError(obj)
+
+    cache = ReprCache(failing_repr, key=str)
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(cache, "a") for _ in range(2)]
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="a"):
+                future.result(timeout=5)
+
+    assert cache.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_compression(compression):
+    """Compressed entries should be smaller and decompress to the original repr."""
+    rep = "<li><details><summary>Feature</summary></details></li>" * 1_000
+    cache = ReprCache(lambda obj: rep, key=str, compression=compression)
+
+    assert cache("a") == rep
+    assert cache("a") == rep
+
+    info = cache.cache_info()
+    assert info.rawbytes == len(rep)
+    assert info.currbytes < len(rep) / 10
+    assert info.decompress_time > 0
+    assert cache.cache_entries()[0].nbytes == info.currbytes
+
+
+def test_cache_compression_param():
+    """Test that cache_compression is applied to the repr and info caches."""
+    eerepr.initialize(cache_compression="zlib")
+    assert eerepr.repr._repr_html_.compression == "zlib"
+    assert eerepr.repr._info_cache.compression == "zlib"
+
+    with pytest.raises(ValueError, match="cache_compression"):
+        eerepr.initialize(cache_compression="gzip")
+
+
+def test_cassette_persists(tmp_path):
+    """Test that recorded entries are reloaded, keeping the last entry for each key."""
+    path = tmp_path / "cassette.jsonl"
+    cassette = Cassette(path)
+    cassette.record("a", {"type": "Number", "value": 1})
+    cassette.record("b", error="Failed")
+    cassette.record("a", {"type": "Number", "value": 2})
+
+    # A line left incomplete by a killed process is skipped
+    with open(path, "a") as file:
+        file.write('{"key": "c", "in')
+
+    cassette = Cassette(path)
+    assert len(cassette) == 2
+    assert cassette.get("a") == {"info": {"type": "Number", "value": 2}}
+    assert cassette.get("b") == {"error": "Failed"}
+    assert "c" not in cassette
+
+
+def test_cassette_replay(tmp_path, mocker):
+    """Test that reprs replayed from a cassette match the recorded reprs without
+    fetching any info.
+    """
+    path = tmp_path / "cassette.jsonl"
+    objects = list(get_test_objects().values())
+
+    eerepr.initialize(max_cache_size=0, cassette=path, cassette_mode="record")
+    recorded = [obj._repr_html_() for obj in objects]
+    with pytest.warns(UserWarning, match="Getting info failed"):
+        ee.Projection("not a real epsg")._repr_html_()
+
+    get_info = mocker.patch("ee.ComputedObject.getInfo", side_effect=RuntimeError)
+    eerepr.initialize(max_cache_size=0, cassette=path)
+    assert [obj._repr_html_() for obj in objects] == recorded
+    with pytest.warns(UserWarning, match="Getting info failed"):
+        ee.Projection("not a real epsg")._repr_html_()
+    with pytest.warns(UserWarning, match="No info was recorded"):
+        ee.Number(-1)._repr_html_()
+    get_info.assert_not_called()
+
+    with pytest.raises(FileNotFoundError):
+        eerepr.initialize(cassette=tmp_path / "missing.jsonl")
+    with pytest.raises(ValueError, match="cassette_mode"):
+        eerepr.initialize(cassette=path, cassette_mode="rewind")
+
+
+def test_cassette_cached_info(tmp_path, mocker):
+    """Test that info cached before switching cassettes is recorded and replayed."""
+    path = tmp_path / "cassette.jsonl"
+    eerepr.initialize()
+    rep = ee.Number(42)._repr_html_()
+
+    eerepr.initialize(cassette=path, cassette_mode="record")
+    assert ee.Number(42)._repr_html_() == rep
+    assert len(Cassette(path)) == 1
+
+    get_info = mocker.patch("ee.ComputedObject.getInfo", side_effect=RuntimeError)
+    eerepr.initialize(cassette=path)
+    assert ee.Number(42)._repr_html_() == rep
+    get_info.assert_not_called()
@@ -1,9 +1,9 @@
-from functools import _lru_cache_wrapper
-
 import ee
 import pytest
 
 import eerepr
+from eerepr.cache import ReprCache
+from eerepr.style import COMPACT_CSS
 
 
 @pytest.mark.parametrize("max_cache_size", [0, None, 1, 10])
@@ -14,7 +14,7 @@ def test_cache_params(max_cache_size):
     eerepr.initialize(max_cache_size=max_cache_size)
 
     if max_cache_size == 0:
-        assert not isinstance(eerepr.repr._repr_html_, _lru_cache_wrapper)
+        assert not isinstance(eerepr.repr._repr_html_, ReprCache)
     else:
         assert eerepr.repr._repr_html_.cache_info().maxsize == max_cache_size
 
@@ -42,3 +42,143 @@ def test_on_error():
     eerepr.initialize(on_error="raise")
     with pytest.raises(ee.EEException):
         invalid_obj._repr_html_()
+
+
+def test_truncate_reprs():
+    """Test that truncate_reprs renders a truncated repr within max_repr_mbs."""
+    max_repr_mbs = 0.05
+    eerepr.initialize(max_repr_mbs=max_repr_mbs, truncate_reprs=True)
+
+    rep = ee.List.sequence(0, 10_000)._repr_html_()
+    assert "<pre>" not in rep
+    assert "(truncated)" in rep
+    assert len(rep) <= max_repr_mbs * 1e6
+    assert rep.count("<details>") == rep.count("</details>")
+
+
+def test_async_mode(mocker):
+    """Test that async reprs display a placeholder and update it once fetched."""
+    handle = mocker.MagicMock()
+    mocker.patch("eerepr.repr._display_placeholder", return_value=handle)
+    submit = mocker.spy(eerepr.repr, "_submit")
+    eerepr.initialize(mode="async")
+
+    obj = ee.Image.constant(0).set("system:id", "foo")
+    assert obj._repr_html_() == ""
+    submit.spy_return.result()
+
+    rep = handle.update.call_args.args[0]["text/html"]
+    assert "foo" in rep
+    # The fetched repr is cached and displayed immediately the next time
+    assert obj._repr_html_() == rep
+    assert handle.update.call_count == 1
+
+
+def test_async_mode_on_error(mocker, recwarn):
+    """Test that async reprs respect on_error."""
+    handle = mocker.MagicMock()
+    mocker.patch("eerepr.repr._display_placeholder", return_value=handle)
+    submit = mocker.spy(eerepr.repr, "_submit")
+    invalid_obj = ee.Projection("not a real epsg")
+
+    eerepr.initialize(mode="async", on_error="warn")
+    # The warning is raised from the worker thread, so it's recorded for the whole test
+    invalid_obj._repr_html_()
+    submit.spy_return.result()
+    assert "Getting info failed" in str(recwarn.pop(UserWarning).message)
+    assert "Projection object" in handle.update.call_args.args[0]["text/html"]
+
+    eerepr.initialize(mode="async", on_error="raise")
+    invalid_obj._repr_html_()
+    with pytest.raises(ee.EEException):
+        submit.spy_return.result()
+
+
+def test_stylesheet_once():
+    """Test that stylesheet="once" only includes the stylesheet in the first repr."""
+    eerepr.initialize(stylesheet="once")
+
+    assert "<style>" in ee.Number(0)._repr_html_()
+    assert "<style>" not in ee.Number(0)._repr_html_()
+    assert "<style>" not in ee.Number(1)._repr_html_()
+
+    # Re-initializing should include the stylesheet again
+    eerepr.initialize(stylesheet="once")
+    assert "<style>" in ee.Number(0)._repr_html_()
+
+    eerepr.initialize(stylesheet="inline")
+    assert "<style>" in ee.Number(0)._repr_html_()
+    assert "<style>" in ee.Number(0)._repr_html_()
+
+
+def test_compact_markup():
+    """Test that markup="compact" renders with the compact stylesheet."""
+    eerepr.initialize(markup="compact")
+    rep = ee.Image.constant(0).set("system:id", "foo")._repr_html_()
+
+    assert COMPACT_CSS in rep
+    assert "<b>id:</b>foo<br>" in rep
+
+
+def test_markup_set_directly():
+    """Test that reprs cached with other markup aren't displayed after changing it."""
+    eerepr.initialize()
+    obj = ee.Image.constant(0).set("system:id", "foo")
+    obj._repr_html_()
+
+    eerepr.options.markup = "compact"
+    rep = obj._repr_html_()
+    assert "<b>id:</b>foo<br>" in rep
+    assert "<li>" not in rep
+
+
+def test_collect_stats():
+    """Test that collect_stats records events by type and forwards them to hooks."""
+    events = []
+    eerepr.register_stats_hook(events.append)
+    try:
+        eerepr.initialize(collect_stats=True)
+        eerepr.stats(reset=True)
+        ee.Number(0)._repr_html_()
+        ee.Number(0)._repr_html_()
+
+        stats = eerepr.stats(reset=True)["Number"]
+        assert stats["miss"].count == 1
+        assert stats["hit"].count == 1
+        assert stats["fetch"].count == 1
+        assert stats["render"].count == 1
+        assert stats["display"].count == 2
+        assert stats["display"].total_bytes > stats["render"].total_bytes > 0
+        assert [e.name for e in events if e.ee_type == "Number"] == [
+            "miss",
+            "fetch",
+            "render",
+            "display",
+            "hit",
+            "display",
+        ]
+
+        eerepr.initialize(collect_stats=False)
+        events.clear()
+        ee.Number(0)._repr_html_()
+        assert not events
+        assert not eerepr.stats()
+    finally:
+        eerepr.unregister_stats_hook(events.append)
+
+
+def test_stats_hook_errors(recwarn):
+    """Test that a failing stats hook is warned about once without breaking reprs."""
+
+    def hook(event):
+        raise ValueError("broken hook")
+
+    eerepr.register_stats_hook(hook)
+    try:
+        eerepr.initialize(collect_stats=True)
+        assert "<style>" in ee.Number(0)._repr_html_()
+        assert "<style>" in ee.Number(1)._repr_html_()
+    finally:
+        eerepr.unregister_stats_hook(hook)
+
+    assert len([w for w in recwarn if "broken hook" in str(w.message)]) == 1
@@ -1,7 +1,21 @@
+import html
+import sys
+
 import ee
 import pytest
 
-from eerepr.html import convert_to_html
+from eerepr.html import (
+    CLOSE_HTML,
+    MAX_INLINE_LENGTH,
+    MEMO_MAX_MISSES,
+    SIZE_KEY,
+    TRUNCATED_HTML,
+    ReprSizeError,
+    _short_repr,
+    _subtree_key,
+    convert_to_html,
+)
+from eerepr.text import convert_to_text
 
 
 def get_test_objects() -> list:
@@ -91,3 +105,211 @@ def get_test_objects() -> list:
 def test_regression_objects(key_val, data_regression):
     """Test the HTML repr of various EE objects."""
     data_regression.check(convert_to_html(key_val[1].getInfo()))
+
+
+def test_summarized_collection_labels():
+    """Summarized collections should be labeled with their true size."""
+    info = {"type": "FeatureCollection", "columns": {}, "features": [{}], SIZE_KEY: 42}
+    rendered = convert_to_html(info)
+    assert "(42 elements, 0 columns)" in rendered
+    assert "size" not in rendered
+
+    info = {"type": "ImageCollection", "features": [{}], SIZE_KEY: 42}
+    rendered = convert_to_html(info)
+    assert "ImageCollection (42 elements)" in rendered
+    assert "size" not in rendered
+    assert "size" not in convert_to_text(info)
+
+
+def test_deeply_nested_info():
+    """Deeply nested objects should render without hitting the recursion limit."""
+    depth = sys.getrecursionlimit() * 2
+    nested: list = []
+    node = nested
+    for _ in range(depth):
+        node.append([])
+        node = node[0]
+
+    rendered = convert_to_html(nested)
+    assert rendered.count("<details>") == depth + 1
+    assert rendered.endswith("</ul></details></li>" * (depth + 1))
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        [],
+        [1, "two", 3.0, None, True],
+        [[1, 2], {"a": [3, {"b": 4}]}],
+        [{"key": "x" * 20}, "y" * 20],
+        ["x" * 60],
+        eval("[" * 30 + "]" * 30),
+    ],
+)
+def test_short_repr(obj):
+    """Lazily stringified lists should match their native repr when not truncated."""
+    expected = str(obj) if len(str(obj)) < MAX_INLINE_LENGTH else None
+    assert _short_repr(obj) == expected
+
+
+def test_max_bytes():
+    """Rendering should stop once max_bytes is exceeded."""
+    info = list(range(1_000))
+    rendered = convert_to_html(info)
+
+    assert convert_to_html(info, max_bytes=len(rendered)) == rendered
+    with pytest.raises(ReprSizeError):
+        convert_to_html(info, max_bytes=len(rendered) - 1)
+
+
+@pytest.mark.parametrize("max_bytes", [0, 100, 1_000, 10_000])
+def test_max_bytes_truncate(max_bytes):
+    """Truncated HTML should fit within max_bytes and close all open elements."""
+    info = {"foo": [list(range(100)) for _ in range(100)]}
+    rendered = convert_to_html(info, max_bytes=max_bytes, truncate=True)
+
+    assert len(rendered) <= max_bytes or rendered == TRUNCATED_HTML
+    assert rendered.endswith(CLOSE_HTML) or rendered == TRUNCATED_HTML
+    assert rendered.count("<li>") == rendered.count("</li>")
+    assert rendered.count("<details>") == rendered.count("</details>")
+
+
+def test_escapes_html():
+    """Strings in keys, values, labels, and inline lists should be escaped."""
+    script = "<script>alert('foo')</script>"
+    info = {
+        script: script,
+        "type": script,
+        "id": script,
+        "short_list": [script],
+        "band": {
+            "id": script,
+            "crs": script,
+            "data_type": {"type": "PixelType", "precision": script},
+        },
+        "feature": {"type": "Feature", "geometry": {"type": script}},
+    }
+    rendered = convert_to_html(info)
+    assert "<script>" not in rendered
+    assert html.escape(script) in rendered
+
+
+def test_compact_arrays():
+    """Long numeric lists should render as a compact text block with their shape."""
+    info = {
+        "type": "Polygon",
+        "coordinates": [[[float(i), float(-i)] for i in range(100)]],
+    }
+    rendered = convert_to_html(info, compact_arrays=True)
+
+    assert "Polygon (100 vertices)" in rendered
+    assert "coordinates: List (1x100x2, min -99.0, max 99.0)" in rendered
+    assert "<pre class='ee-a'>0.0, 0.0\n1.0, -1.0\n" in rendered
+    assert rendered.count("<li>") == 3
+
+
+@pytest.mark.parametrize(
+    "info",
+    [
+        [1, 2, 3],
+        [True] * 20,
+        ["1"] * 20,
+        [[1, 2], [3]] * 10,
+        [[1, 2], 3] * 10,
+    ],
+    ids=["inline", "bool", "str", "ragged", "mixed"],
+)
+def test_compact_arrays_skipped(info):
+    """Short, ragged, or non-numeric lists should render normally."""
+    assert convert_to_html(info, compact_arrays=True) == convert_to_html(info)
+
+
+def test_compact_markup():
+    """Compact markup should have the same structure and content in fewer bytes."""
+    info = {
+        "type": "Image",
+        "id": "foo",
+        "properties": {"name": "<b>", "values": list(range(30))},
+    }
+    rendered = convert_to_html(info)
+    compact = convert_to_html(info, markup="compact")
+
+    assert len(compact) < len(rendered) / 2
+    assert compact.count("<details>") == rendered.count("<details>")
+    assert compact.count("<details>") == compact.count("</details>")
+    assert "<li>" not in compact
+    assert "<b>name:</b>&lt;b&gt;<br>" in compact
+
+
+def test_compact_markup_truncate():
+    """Truncated compact markup should fit within max_bytes and close all elements."""
+    info = {"foo": [list(range(100)) for _ in range(100)]}
+    rendered = convert_to_html(info, max_bytes=1_000, truncate=True, markup="compact")
+
+    assert len(rendered) <= 1_000
+    assert "… (truncated)<br>" in rendered
+    assert rendered.count("<details>") == rendered.count("</details>")
+
+
+def test_list_buckets():
+    """Long lists should be grouped into nested ranges of at most bucket_size."""
+    rendered = convert_to_html(list(range(1_000)), bucket_size=10)
+
+    assert rendered.startswith(
+        "<li><details><summary>List (1000 elements)</summary><ul>"
+        "<li><details><summary>[0…99]</summary><ul>"
+        "<li><details><summary>[0…9]</summary><ul>"
+        "<li><span class='ee-k'>0:</span><span class='ee-v'>0</span></li>"
+    )
+    assert "<summary>[990…999]</summary>" in rendered
+    assert "<span class='ee-k'>999:</span>" in rendered
+    assert rendered.count("<summary>") == 1 + 10 + 100
+
+    # Lists that fit in one bucket aren't grouped
+    assert convert_to_html(list(range(10)), bucket_size=10) == convert_to_html(
+        list(range(10))
+    )
+
+
+@pytest.mark.parametrize("bucket_size", [None, 10])
+def test_max_list_elements(bucket_size):
+    """Only the first max_list_elements should be rendered, followed by a count."""
+    rendered = convert_to_html(
+        list(range(1_000)), bucket_size=bucket_size, max_list_elements=15
+    )
+
+    assert "List (1000 elements)" in rendered
+    assert "<span class='ee-k'>14:</span>" in rendered
+    assert "<span class='ee-k'>15:</span>" not in rendered
+    assert rendered.endswith(
+        "<li><span class='ee-v'>… 985 more</span></li></ul></details></li>"
+    )
+
+
+@pytest.mark.parametrize("max_bytes", [None, 1_000, 5_000])
+def test_memoized_subtrees(max_bytes, monkeypatch):
+    """Repeated subtrees should render the same with and without memoization."""
+    band = {
+        "id": "B1",
+        "data_type": {"type": "PixelType", "precision": "int", "min": 0, "max": 255},
+        "crs": "EPSG:4326",
+        "crs_transform": [1, 0, 0, 0, 1, 0],
+    }
+    info = {
+        "type": "ImageCollection",
+        "features": [{"type": "Image", "bands": [band, band]} for _ in range(5)],
+    }
+    kwargs = {"max_bytes": max_bytes, "truncate": True}
+
+    rendered = convert_to_html(info, **kwargs)
+    monkeypatch.setattr("eerepr.html.MEMO_SIZE", 0)
+    assert rendered == convert_to_html(info, **kwargs)
+
+
+def test_memo_stops_after_misses(mocker):
+    """Subtrees should stop being keyed once they stop repeating."""
+    subtree_key = mocker.patch("eerepr.html._subtree_key", side_effect=_subtree_key)
+    convert_to_html([{"id": i} for i in range(1_000)])
+
+    # The list itself is too long to memoize, then each unique element misses
+    assert subtree_key.call_count == MEMO_MAX_MISSES + 1
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+# The maximum time to import eerepr, in microseconds. This is far above the actual
+# import time, but far below the time to import Earth Engine.
+IMPORT_TIME_BUDGET = 100_000
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter, since Earth Engine is already imported here."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_is_lazy():
+    """Test that importing eerepr doesn't import Earth Engine or the stylesheet."""
+    result = run_python(
+        "import sys, eerepr; print('ee' in sys.modules, 'eerepr.style' in sys.modules)"
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+    # The last line of the import time report is the cumulative time for eerepr
+    report = result.stderr.strip().splitlines()[-1].split("|")
+    assert report[-1].strip() == "eerepr"
+    assert int(report[1]) < IMPORT_TIME_BUDGET
+
+
+def test_initialize_imports_ee():
+    """Test that public attributes are loaded on first access."""
+    result = run_python(
+        "import sys, eerepr; eerepr.initialize; print('ee' in sys.modules)"
+    )
+    assert result.stdout.split() == ["True"]
@@ -1,4 +1,5 @@
 import ee
+import pytest
 
 import eerepr
 
@@ -23,6 +24,41 @@ def test_initialize_and_reset():
     assert not hasattr(ee.Number(1), "_repr_html_")
 
 
+def test_initialize_during_display(mocker):
+    """Options changed while a repr is rendering should only apply to later reprs."""
+    eerepr.initialize(max_cache_size=0)
+    expected = ee.Number(1)._repr_html_()
+    get_info = eerepr.repr._get_info
+
+    def reinitialize(obj):
+        eerepr.initialize(max_cache_size=0, markup="compact")
+        return get_info(obj)
+
+    mocker.patch("eerepr.repr._get_info", side_effect=reinitialize)
+    assert ee.Number(1)._repr_html_() == expected
+    assert eerepr.options.markup == "compact"
+
+
+def test_initialize_during_cached_display(mocker):
+    """Reprs rendering while re-initializing should only use the caches they started
+    with.
+    """
+    eerepr.reset()
+    eerepr.initialize()
+    info_cache = eerepr.repr._info_cache
+    render_html = eerepr.repr._render_html
+
+    def reinitialize(obj):
+        eerepr.initialize(cache_compression="zlib")
+        return render_html(obj)
+
+    mocker.patch("eerepr.repr._render_html", side_effect=reinitialize)
+    obj = ee.Number(1)
+    obj._repr_html_()
+    assert obj in info_cache
+    assert obj not in eerepr.repr._info_cache
+
+
 def test_existing_repr_html():
     """If an object already has a _repr_html_, eerepr shouldn't touch it."""
 
@@ -55,3 +91,85 @@ def test_scripts_sanitized():
 
     obj = ee.Dictionary({script_injection: script_injection, "type": script_injection})
     assert "<script>" not in obj._repr_html_()
+
+
+def test_max_collection_elements():
+    """Large collections should only fetch their first elements but label the total."""
+    eerepr.initialize(max_collection_elements=1)
+
+    images = ee.ImageCollection([ee.Image.constant(0), ee.Image.constant(1)])
+    rep = images._repr_html_()
+    assert "ImageCollection (2 elements)" in rep
+    assert "features: List (1 element)" in rep
+    assert "size:" not in rep
+
+    point = ee.Feature(ee.Geometry.Point([0, 0]))
+    features = ee.FeatureCollection([point, point, point])
+    rep = features._repr_html_()
+    assert "FeatureCollection (3 elements" in rep
+    assert "features: List (1 element)" in rep
+
+
+def test_compact_arrays():
+    """Test that compact_arrays renders long coordinate lists as a text block."""
+    eerepr.initialize(compact_arrays=True)
+
+    coords = [[i / 100, i / 100] for i in range(100)] + [[0, 0]]
+    rep = ee.Geometry.LineString(coords)._repr_html_()
+    assert "LineString (101 vertices)" in rep
+    assert "<pre class='ee-a'>" in rep
+
+
+def test_repr_mimebundle(mocker):
+    """Test that the mimebundle only includes the requested formats."""
+    eerepr.initialize()
+    obj = ee.Dictionary({"foo": "<bar>"})
+    render = mocker.spy(eerepr.repr, "_render_html")
+
+    bundle = obj._repr_mimebundle_(include=["text/plain"])
+    assert bundle == {"text/plain": "Object (1 property)\n  foo: <bar>"}
+    render.assert_not_called()
+
+    bundle = obj._repr_mimebundle_(exclude=["text/plain"])
+    assert list(bundle) == ["text/html"]
+    assert "foo" in bundle["text/html"]
+    render.assert_called_once()
+
+    eerepr.reset()
+    assert not hasattr(ee.Number(1), "_repr_mimebundle_")
+
+
+def test_repr_mimebundle_fetches_once(mocker):
+    """Test that a bundle with both formats only fetches info once."""
+    eerepr.initialize(max_cache_size=0)
+    obj = ee.Dictionary({"foo": "bar"})
+    fetch = mocker.spy(eerepr.repr, "_fetch_info")
+
+    bundle = obj._repr_mimebundle_(include=["text/html", "text/plain"])
+    assert bundle["text/plain"] == repr(obj)
+    fetch.assert_called_once()
+
+
+def test_pretty_containers_not_fetched(mocker):
+    """Pretty printing a container of EE objects shouldn't fetch their info."""
+    pretty = pytest.importorskip("IPython.lib.pretty").pretty
+    eerepr.initialize()
+    get_info = mocker.patch("ee.ComputedObject.getInfo")
+
+    pretty([ee.Number(1), ee.Number(2), ee.Number(3)])
+    get_info.assert_not_called()
+
+
+def test_list_buckets():
+    """Test that list_bucket_size groups long lists into ranges."""
+    eerepr.initialize(list_bucket_size=10, max_list_elements=50)
+
+    rep = ee.List.sequence(0, 99)._repr_html_()
+    assert "<summary>[0…9]</summary>" in rep
+    assert "<summary>[40…49]</summary>" in rep
+    assert "… 50 more" in rep
+
+    with pytest.raises(ValueError, match="list_bucket_size"):
+        eerepr.initialize(list_bucket_size=1)
+    with pytest.raises(ValueError, match="max_list_elements"):
+        eerepr.initialize(max_list_elements=-1)
@@ -0,0 +1,47 @@
+from eerepr.text import convert_to_text
+
+INFO = {
+    "type": "Image",
+    "id": "<b>image</b>",
+    "bands": [{"id": f"B{i}", "crs": "EPSG:4326"} for i in range(3)],
+    "properties": {"coords": [0, 1], "nested": {"a": {"b": 1}}},
+}
+
+
+def test_convert_to_text():
+    """Test that info is converted to an indented tree with unescaped labels."""
+    assert convert_to_text(INFO).splitlines() == [
+        "Image <b>image</b> (3 bands)",
+        "  type: Image",
+        "  id: <b>image</b>",
+        "  bands: List (3 elements)",
+        "    0: Object (2 properties)",
+        "    1: Object (2 properties)",
+        "    2: Object (2 properties)",
+        "  properties: Object (2 properties)",
+        "    coords: [0, 1]",
+        "    nested: Object (1 property)",
+    ]
+
+
+def test_convert_to_text_limits():
+    """Test that depth, item, and width limits are applied."""
+    text = convert_to_text(INFO, max_depth=None, max_items=None, max_width=None)
+    assert "        b: 1" in text.splitlines()
+
+    lines = convert_to_text(INFO, max_depth=1, max_items=2, max_width=20).splitlines()
+    assert lines == [
+        "Image <b>image</b> …",
+        "  type: Image",
+        "  id: <b>image</b>",
+        "  … (2 more)",
+    ]
+
+
+def test_convert_deeply_nested_text():
+    """Test that deeply nested info doesn't hit the recursion limit."""
+    info: dict = {}
+    for _ in range(5_000):
+        info = {"child": info}
+
+    assert len(convert_to_text(info, max_depth=None).splitlines()) == 5_001